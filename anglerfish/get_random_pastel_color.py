@@ -240,3 +240,13 @@ def get_random_pastel_color(tone=None, black_list: list=None) -> namedtuple:
         color, hexa, rgb, hls, hsv, yiq,
         f"rgb({rgb.red},{rgb.green},{rgb.blue})",  # rgb(int, int, int)
         f"rgb({per(rgb.red)}%,{per(rgb.green)}%,{per(rgb.blue)}%)")  # rgb(%,%)
+
+
+def get_random_pasteldark_color(black_list: list=None) -> namedtuple:
+    """Get a random dark color as string, useful for CSS styling."""
+    return get_random_pastel_color(tone="dark", black_list=black_list)
+
+
+def get_random_pastelight_color(black_list: list=None) -> namedtuple:
+    """Get a random light color as string, useful for CSS styling."""
+    return get_random_pastel_color(tone="light", black_list=black_list)
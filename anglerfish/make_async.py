@@ -10,9 +10,53 @@ This enables to seamlessly mix sync and async code, see docs for examples.
 
 
 import asyncio
-# import atexit  # See Line 105.
 import functools
+import os
 import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
+
+_THREAD_POOL, _PROCESS_POOL, _POOL_LOCK = None, None, threading.Lock()
+_MAX_WORKERS = {"threads": min(32, (os.cpu_count() or 1) + 4),
+                "processes": os.cpu_count() or 1}
+
+
+def _get_thread_pool() -> ThreadPoolExecutor:
+    """Get the shared Thread Pool, created on first use, reused forever."""
+    global _THREAD_POOL
+    with _POOL_LOCK:
+        if _THREAD_POOL is None:
+            _THREAD_POOL = ThreadPoolExecutor(
+                max_workers=_MAX_WORKERS["threads"],
+                thread_name_prefix="angler")
+    return _THREAD_POOL
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Get the shared Process Pool, created on first use, reused forever."""
+    global _PROCESS_POOL
+    with _POOL_LOCK:
+        if _PROCESS_POOL is None:
+            _PROCESS_POOL = ProcessPoolExecutor(
+                max_workers=_MAX_WORKERS["processes"])
+    return _PROCESS_POOL
+
+
+def _set_max_workers(threads: int=None, processes: int=None) -> dict:
+    """Resize the shared Pools, the old Pools finish its work on background."""
+    global _THREAD_POOL, _PROCESS_POOL
+    with _POOL_LOCK:
+        if threads and threads != _MAX_WORKERS["threads"]:
+            if _THREAD_POOL is not None:
+                _THREAD_POOL.shutdown(wait=False)
+            _THREAD_POOL, _MAX_WORKERS["threads"] = None, int(threads)
+        if processes and processes != _MAX_WORKERS["processes"]:
+            if _PROCESS_POOL is not None:
+                _PROCESS_POOL.shutdown(wait=False)
+            _PROCESS_POOL, _MAX_WORKERS["processes"] = None, int(processes)
+        return dict(_MAX_WORKERS)
 
 
 ###############################################################################
@@ -36,61 +80,135 @@ class _AsyncCall(object):
 
 class _AsyncProcessingCall(object):
 
-    """A low level sync code fragment to be run asynchronously on a Process."""
-    __slots__ = ("event_loop", "sync_code", "args", "kwargs")
+    """A low level sync code fragment to be run asynchronously on a Process.
 
-    def __init__(self, event_loop, sync_code):
+    Runs on a reused Process Pool, sync code and arguments must be picklable,
+    CPU-bound code runs in parallel on all the CPUs, without the GIL."""
+    __slots__ = ("event_loop", "sync_code", "args", "kwargs", "executor")
+
+    def __init__(self, event_loop, sync_code, executor=None):
         self.event_loop, self.sync_code = event_loop, sync_code
+        self.executor = executor or _get_process_pool()
 
     def __repr__(self):
         return "<{0}: {1}>".format(self.__class__.__name__,
                                    repr(self.sync_code))
 
     async def __call__(self, *args, **kwargs):
-        return await self.event_loop.run_in_executor(
-            None, functools.partial(self.sync_code, *args, **kwargs))
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, functools.partial(self.sync_code, *args, **kwargs))
 
 
 class _AsyncThreadingCall(object):
 
-    """A low level sync code fragment to be run asynchronously on a Thread."""
-    __slots__ = ("event_loop", "sync_code", "args", "kwargs", "tread")
+    """A low level sync code fragment to be run asynchronously on a Thread.
 
-    def __init__(self, event_loop, sync_code, tread=None):
+    Runs on a reused bounded Thread Pool, the Thread completes the asyncio
+    Future with loop.call_soon_threadsafe, no polling, no new Threads."""
+    __slots__ = ("event_loop", "sync_code", "args", "kwargs", "executor")
+
+    def __init__(self, event_loop, sync_code, executor=None):
         self.event_loop, self.sync_code = event_loop, sync_code
-        self.tread = tread
+        self.executor = executor or _get_thread_pool()
 
     def __repr__(self):
         return "<{0}: {1}>".format(self.__class__.__name__,
                                    repr(self.sync_code))
 
-    def _run_future(self, sync_function, future):
-        try:
-            future.set_result(sync_function())
-        except Exception as error:
+    @staticmethod
+    def _set_future(future, result, error):
+        """Complete the Future, runs on the event loop Thread."""
+        if future.cancelled():
+            return
+        if error is None:
+            future.set_result(result)
+        else:
             future.set_exception(error)
-        self.tread = None
-        return self.tread
 
-    async def _run_thread(self, sync_function, future):
-        tread = threading.Thread(target=self._run_future, name="angler",
-                                 args=(sync_function, future))
-        tread.start()
-        self.tread = tread
-        return self.tread
+    def _run_future(self, event_loop, future, sync_function):
+        """Run the sync function, runs on a Thread of the Thread Pool."""
+        if future.cancelled():
+            return
+        result = error = None
+        try:
+            result = sync_function()
+        except Exception as exception:
+            error = exception
+        try:
+            event_loop.call_soon_threadsafe(
+                self._set_future, future, result, error)
+        except RuntimeError:
+            pass  # Event loop closed meanwhile, nobody is waiting.
 
     async def __call__(self, *args, **kwargs):
-        sync_function = functools.partial(self.sync_code, *args, **kwargs)
-        future, results = asyncio.Future(), None
-        asyncio.ensure_future(self._run_thread(sync_function, future),
-                              loop=self.event_loop)
-        future_done, asyncio_sleep = future.done, asyncio.sleep  # Optimization
+        event_loop = asyncio.get_running_loop()
+        future = event_loop.create_future()
+        self.executor.submit(
+            self._run_future, event_loop, future,
+            functools.partial(self.sync_code, *args, **kwargs))
+        return await future
+
+
+def _call_chunk(sync_code, chunk: tuple) -> list:
+    """Call the sync code with each item of 1 chunk, runs on the executor."""
+    return [sync_code(_) for _ in chunk]
+
+
+async def _map_chunks(sync_code, iterable, concurrency: int, chunksize: int,
+                      ordered: bool, executor):
+    """Yield sync_code(item) for all the items, on chunks, on the executor.
+
+    At most concurrency chunks of chunksize items are running at any time,
+    the iterable is consumed only when there is room, constant memory.
+    If ordered, results are on the order of the iterable, else as completed,
+    any chunk done makes room for a new one, up to 16 per slot buffered.
+    """
+    event_loop, iterator = asyncio.get_running_loop(), iter(iterable)
+    chunks = iter(lambda: tuple(islice(iterator, chunksize)), ())
+    pending, completed = deque() if ordered else set(), deque()
+    add, running, wakeup = (pending.append if ordered else pending.add,
+                            0, asyncio.Event())
+
+    def finished(future) -> None:
+        """Count a chunk done, runs on the event loop Thread, O(1)."""
+        nonlocal running
+        running -= 1
+        if not ordered:
+            completed.append(future)
+        wakeup.set()
+
+    def fill() -> None:
+        nonlocal running
+        while len(pending) < concurrency * 16 and running < concurrency:
+            chunk = next(chunks, None)
+            if chunk is None:
+                return
+            future = event_loop.run_in_executor(
+                executor, _call_chunk, sync_code, chunk)
+            future.add_done_callback(finished)
+            add(future)
+            running += 1
+
+    try:
         while True:
-            if future_done():
-                results = future.result()
-                break
-            await asyncio_sleep(.1)
-        return results
+            fill()
+            if ordered and pending and pending[0].done():
+                future = pending.popleft()
+            elif not ordered and completed:
+                future = completed.popleft()
+                pending.discard(future)
+            elif pending or running:  # Also done, but callback not run yet.
+                wakeup.clear()
+                await wakeup.wait()
+                continue
+            else:
+                break  # Nothing running and nothing left on the iterable.
+            fill()  # Refill before yielding, executor keeps working.
+            for result in future.result():
+                yield result
+    finally:
+        for future in pending:
+            future.cancel()  # Consumer stopped early or sync code failed.
 
 
 ###############################################################################
@@ -101,38 +219,63 @@ class Sync2Async(object):
     """Run Sync code as Async."""
     __slots__ = ("args", "kwargs")
 
-    event_loop = asyncio.get_event_loop()
-    # atexit.register(asyncio.get_event_loop().close)  # Use if hangs at exit.
+    @staticmethod
+    def _get_sync_code(args: tuple) -> tuple:
+        """Get the sync code and its arguments, skip an old explicit loop."""
+        if isinstance(args[0], asyncio.AbstractEventLoop):
+            args = args[1:]  # Backwards compatible, the running loop is used.
+        return args[0], args[1:]
 
     @classmethod
     def get_event_loop(cls, *args, **kwargs):
-        return cls.event_loop
+        """Get the running event loop, else the event loop of this Thread."""
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.get_event_loop_policy().get_event_loop()
+
+    @classmethod
+    def set_max_workers(cls, threads: int=None, processes: int=None) -> dict:
+        """Resize the shared Thread and Process Pools, None keeps its size."""
+        return _set_max_workers(threads, processes)
+
+    @classmethod
+    def map(cls, sync_code, iterable, concurrency: int=None,
+            chunksize: int=1, ordered: bool=True, processes: bool=False):
+        """Async iterator of sync_code(item) for all the items of iterable.
+
+        Runs on the shared Thread Pool, or Process Pool if processes,
+        bounded to concurrency chunks of chunksize items in flight."""
+        workers = _MAX_WORKERS["processes" if processes else "threads"]
+        return _map_chunks(
+            sync_code, iterable, max(1, concurrency or workers * 2),
+            max(1, chunksize), ordered,
+            _get_process_pool() if processes else _get_thread_pool())
+
+    @classmethod
+    def as_completed(cls, sync_code, iterable, concurrency: int=None,
+                     chunksize: int=1, processes: bool=False):
+        """Async iterator of sync_code(item) for all items, as completed."""
+        return cls.map(sync_code, iterable, concurrency, chunksize,
+                       ordered=False, processes=processes)
 
     @classmethod
     async def run_async(cls, *args, **kwargs):
-        if cls.event_loop:
-            event_loop, sync_code, args = cls.event_loop, args[0], args[1:]
-        else:
-            event_loop, sync_code, args = args[0], args[1], args[2:]
-        return await _AsyncCall(event_loop, sync_code)(*args, **kwargs)
+        sync_code, args = cls._get_sync_code(args)
+        return await _AsyncCall(
+            asyncio.get_running_loop(), sync_code)(*args, **kwargs)
 
     @classmethod
     async def run_async_on_process(cls, *args, **kwargs):
-        if cls.event_loop:
-            event_loop, sync_code, args = cls.event_loop, args[0], args[1:]
-        else:
-            event_loop, sync_code, args = args[0], args[1], args[2:]
+        sync_code, args = cls._get_sync_code(args)
         return await _AsyncProcessingCall(
-            event_loop, sync_code)(*args, **kwargs)
+            asyncio.get_running_loop(), sync_code)(*args, **kwargs)
 
     @classmethod
     async def run_async_on_thread(cls, *args, **kwargs):
-        if cls.event_loop:
-            event_loop, sync_code, args = cls.event_loop, args[0], args[1:]
-        else:
-            event_loop, sync_code, args = args[0], args[1], args[2:]
+        sync_code, args = cls._get_sync_code(args)
         return await _AsyncThreadingCall(
-            event_loop, sync_code)(*args, **kwargs)
+            asyncio.get_running_loop(), sync_code)(*args, **kwargs)
 
     def __setattr__(self, *args, **kwargs):
         raise TypeError("Anglers Sync2Async object is inmmutable read-only.")
@@ -10,38 +10,237 @@ is more human friendly than SHA512 checksum and its builtin on the filename,
 Adler32 is standard on all ZIP files and its builtin on Python std lib.
 I do this tired of people not using SHA512 on 1 separate txt file for checksum,
 this not require user command line skills to check the checksum, its automagic.
+
+Other algorithms are CRC32 and a short Blake2b, named on the filename,
+like 'file.✔crc32-1a2b3c4d.txt', Adler32 is not named, like 'file.✔1a2b.txt'.
+
+verify_tree() checks a whole folder, caching the checksums on SQLite by inode,
+size and modification time, so only the changed files are read again.
 """
 
 
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from hashlib import blake2b
 from pathlib import Path
-from zlib import adler32
+from zlib import adler32, crc32
 
 
 _STANDARD_PATTERN = ".✔"  # (check mark) use this to signal a selfchecksum
+_CHUNK_SIZE = 1024 * 1024  # Read files on chunks of 1 Megabyte.
+_DEFAULT_ALGORITHM = "adler32"  # Not named on the filename, as it always was.
+_CACHE_FILE = Path.home() / ".cache" / "anglerfish" / "autochecksum.sqlite"
+
+
+class _ZlibHash(object):
+
+    """hashlib-like object for a zlib checksum function, like adler32."""
+    __slots__ = ("function", "value")
+
+    def __init__(self, function, value: int):
+        self.function, self.value = function, value
+
+    def update(self, data: bytes) -> None:
+        self.value = self.function(data, self.value)
+
+    def hexdigest(self) -> str:
+        return hex(self.value & 0xffffffff)[2:]
+
 
+# Algorithm name -> callable that returns a new hashlib-like object.
+ALGORITHMS = {
+    "adler32": partial(_ZlibHash, adler32, 1),
+    "crc32": partial(_ZlibHash, crc32, 0),
+    "blake2b": partial(blake2b, digest_size=8),
+}
 
-def get_autochecksum(filepath: str, pattern: str=_STANDARD_PATTERN) -> str:
+
+def _hash_file(filepath: str, algorithm: str=_DEFAULT_ALGORITHM,
+               chunk_size: int=_CHUNK_SIZE) -> str:
+    """Hash a file, read on chunks into 1 reused buffer, low RAM."""
+    if algorithm not in ALGORITHMS:
+        raise ValueError(
+            f"Invalid algorithm {algorithm}, valid: {tuple(ALGORITHMS)}")
+    hasher = ALGORITHMS[algorithm]()
+    with open(filepath, "rb", buffering=0) as fyle:  # Small files small buffer
+        size = os.fstat(fyle.fileno()).st_size
+        buffer = bytearray(min(chunk_size, size + 1))
+        view, size = memoryview(buffer), fyle.readinto(buffer)
+        while size:  # zlib releases the GIL, Threads can hash in parallel.
+            hasher.update(view[:size])
+            size = fyle.readinto(buffer)
+    return hasher.hexdigest()
+
+
+def _get_algorithm(filepath: Path, pattern: str=_STANDARD_PATTERN) -> str:
+    """Get the algorithm named on the autochecksum of a filename, if any."""
+    for suffix in filepath.suffixes:
+        if suffix.startswith(pattern):
+            name = suffix[len(pattern):].rpartition("-")[0]
+            return name or _DEFAULT_ALGORITHM
+    return None
+
+
+def _format_autochecksum(digest: str, pattern: str=_STANDARD_PATTERN,
+                         algorithm: str=_DEFAULT_ALGORITHM) -> str:
+    """Format a standard autochecksum string from a hexadecimal digest."""
+    name = "" if algorithm == _DEFAULT_ALGORITHM else algorithm + "-"
+    return pattern + name + digest
+
+
+def get_autochecksum(filepath: str, pattern: str=_STANDARD_PATTERN,
+                     algorithm: str=_DEFAULT_ALGORITHM) -> str:
     """Get a standard autochecksum string from file path argument."""
-    return pattern + hex(adler32(Path(filepath).read_bytes()) & 0xffffffff)[2:]
+    return _format_autochecksum(
+        _hash_file(filepath, algorithm), pattern, algorithm)
+
+
+def get_autochecksums(filepaths: tuple, pattern: str=_STANDARD_PATTERN,
+                      max_workers: int=None,
+                      algorithm: str=_DEFAULT_ALGORITHM) -> dict:
+    """Get standard autochecksum strings from many file paths, in parallel.
 
+    Returns a dict with file paths as keys and autochecksums as values."""
+    filepaths = tuple(filepaths)  # Iterated twice, by map and by zip.
+    with ThreadPoolExecutor(max_workers=max_workers,
+                            thread_name_prefix="angler") as pool:
+        checksums = pool.map(lambda filepath: get_autochecksum(
+            filepath, pattern, algorithm), filepaths)
+        return dict(zip(filepaths, checksums))
 
-def autochecksum(filepath: str, update: bool=False) -> Path:
-    """Make a automagic-checksuming file using Adler32 Hash and Hexadecimal."""
+
+def autochecksum(filepath: str, update: bool=False,
+                 algorithm: str=None) -> Path:
+    """Make a automagic-checksuming file using Adler32 Hash and Hexadecimal.
+
+    Checks with the algorithm named on the filename, creates or updates with
+    algorithm if not None, else with the algorithm named or else Adler32."""
     filepath = Path(filepath)
     ext = "".join((_ for _ in filepath.suffixes if _STANDARD_PATTERN not in _))
-    checksum = get_autochecksum(filepath.as_posix())  # Get a selfchecksum str.
-    if _STANDARD_PATTERN in filepath.as_posix() and filepath.is_file():
-        if checksum in filepath.as_posix():
+    named_algorithm = _get_algorithm(filepath)
+    if named_algorithm and named_algorithm not in ALGORITHMS:
+        named_algorithm = _DEFAULT_ALGORITHM  # Not a known name, as it was.
+    if named_algorithm and filepath.is_file():
+        checksum = get_autochecksum(filepath.as_posix(),
+                                    algorithm=named_algorithm)
+        if checksum in filepath.suffixes:
             return True  # File SelfChecksum is Ok, Integrity is Ok.
-        elif checksum not in filepath.as_posix() and not update:
+        elif not update:
             return False  # File SelfChecksum is Wrong, Integrity is NOT Ok.
-        elif checksum not in filepath.as_posix() and update:
+        else:
+            if algorithm and algorithm != named_algorithm:
+                checksum = get_autochecksum(filepath.as_posix(),
+                                            algorithm=algorithm)
             new_file = "{0}{1}{2}".format(
                 filepath.as_posix().split(_STANDARD_PATTERN)[0], checksum, ext)
             filepath.rename(new_file)
             return filepath  # SelfChecksum Wrong,Update checksum.
     elif filepath.is_file():  # File has no selfchecksum,get selfchecksum
+        checksum = get_autochecksum(filepath.as_posix(),
+                                    algorithm=algorithm or _DEFAULT_ALGORITHM)
         new_file = "{0}{1}{2}".format(
             filepath.as_posix().replace(ext, ""), checksum, ext)
         filepath.rename(new_file)
         return filepath
+
+
+class ChecksumCache(object):
+
+    """Persistent cache of file checksums on SQLite, to skip unchanged files.
+
+    Keyed by device, inode and algorithm, valid while size and mtime_ns match.
+    Files modified on the last racy seconds are not cached, because a change
+    so close to the stat may not change its modification time."""
+    __slots__ = ("connection", "racy")
+
+    def __init__(self, database: str=None, racy: int=2):
+        """Open or create the SQLite cache database."""
+        database = Path(database or _CACHE_FILE)
+        database.parent.mkdir(parents=True, exist_ok=True)
+        self.connection, self.racy = sqlite3.connect(str(database)), racy
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS checksums (dev INTEGER, ino INTEGER, "
+            "algorithm TEXT, size INTEGER, mtime_ns INTEGER, digest TEXT, "
+            "PRIMARY KEY (dev, ino, algorithm)) WITHOUT ROWID")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.close()
+
+    def get(self, stat: os.stat_result, algorithm: str) -> str:
+        """Get the cached digest of a file by its stat, None if not cached."""
+        row = self.connection.execute(
+            "SELECT digest FROM checksums WHERE dev=? AND ino=? AND "
+            "algorithm=? AND size=? AND mtime_ns=?", (
+                stat.st_dev, stat.st_ino, algorithm,
+                stat.st_size, stat.st_mtime_ns)).fetchone()
+        return row[0] if row else None
+
+    def put(self, stat: os.stat_result, algorithm: str, digest: str) -> bool:
+        """Cache the digest of a file by its stat, if its not racy."""
+        if time.time_ns() - stat.st_mtime_ns < self.racy * 1_000_000_000:
+            return False
+        self.connection.execute(
+            "INSERT OR REPLACE INTO checksums VALUES (?, ?, ?, ?, ?, ?)", (
+                stat.st_dev, stat.st_ino, algorithm,
+                stat.st_size, stat.st_mtime_ns, digest))
+        return True
+
+    def close(self) -> None:
+        """Commit and close the SQLite cache database."""
+        self.connection.commit()
+        self.connection.close()
+
+
+def _hash_file_stable(filepath: Path, algorithm: str) -> tuple:
+    """Hash a file, return its digest and its stat if unchanged meanwhile."""
+    try:
+        stat = filepath.stat()
+        digest = _hash_file(filepath, algorithm)
+        after = filepath.stat()
+        stable = stat if (stat.st_size, stat.st_mtime_ns) == (
+            after.st_size, after.st_mtime_ns) else None
+    except OSError:
+        return None, None  # Unreadable or deleted, the check fails.
+    return digest, stable
+
+
+def verify_tree(folder: str, cache: str=None, max_workers: int=None,
+                pattern: str=_STANDARD_PATTERN) -> dict:
+    """Verify all the automagic-checksuming files on a folder, recursively.
+
+    Unchanged files since the last verify_tree use the checksum cache,
+    changed or new files are read in parallel, on a Thread Pool.
+    Returns a dict with file paths as keys and True or False as values."""
+    results, pending = {}, []
+    with ChecksumCache(cache) as checksum_cache:
+        for root, _, files in os.walk(folder):
+            for name in files:
+                filepath = Path(root, name)
+                algorithm = _get_algorithm(filepath, pattern)
+                if algorithm not in ALGORITHMS:
+                    continue  # File has no selfchecksum, or not a known one.
+                try:
+                    digest = checksum_cache.get(filepath.stat(), algorithm)
+                except OSError:
+                    digest = None
+                if digest is None:
+                    pending.append((filepath, algorithm))
+                else:
+                    results[filepath] = _format_autochecksum(
+                        digest, pattern, algorithm) in filepath.suffixes
+        with ThreadPoolExecutor(max_workers=max_workers,
+                                thread_name_prefix="angler") as pool:
+            hashed = pool.map(lambda _: _hash_file_stable(*_), pending)
+            for (filepath, algorithm), (digest, stat) in zip(pending, hashed):
+                if stat:
+                    checksum_cache.put(stat, algorithm, digest)
+                results[filepath] = digest is not None and (
+                    _format_autochecksum(digest, pattern, algorithm)
+                    in filepath.suffixes)
+    return results
@@ -0,0 +1,557 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Build and return a Logging Logger, with Colors, Rotation and ZIP."""
+
+
+import atexit
+import faulthandler
+import gzip
+import logging
+import lzma
+import os
+import shutil
+import sys
+import threading
+import time
+import zipfile
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from getpass import getuser
+from locale import getdefaultlocale
+from logging.handlers import (QueueHandler, QueueListener,
+                              TimedRotatingFileHandler)
+from pathlib import Path
+from platform import node, platform, python_version
+from queue import Full, Queue
+from random import choice
+from tempfile import gettempdir
+
+try:
+    from ujson import dumps as json_string
+except ImportError:
+    from json.encoder import encode_basestring_ascii as json_string
+
+from anglerfish.seconds2human import now2human
+from anglerfish.set_process_defaults import set_process_defaults
+
+
+__all__ = ("make_logger", "BoundedQueueHandler", "ColoredFormatter",
+           "JSONFormatter", "RateLimitFilter", "SizedTimedRotatingFileHandler")
+
+
+##############################################################################
+
+
+_LOG_FORMAT = (
+    "%(asctime)s %(levelname)s: %(processName)s (%(process)d) %(threadName)s "
+    "(%(thread)d) %(name)s.%(funcName)s: %(message)s %(pathname)s:%(lineno)d")
+_LOG_DATEFMT = r"%Y-%m-%d %H:%M:%S%z"
+
+
+def _compress_zip(origin: Path, target: Path, level: int) -> None:
+    """Compress origin to target ZIP, with comments."""
+    zip_comment = bytes(f"""ZIP Compressed Unused Old Rotated Python Logs.
+        From {node()}, {platform()}, Python {python_version()},
+        from file {origin}, to file {target}, at time ~{now2human().human},
+        ({datetime.now().replace(microsecond=0).astimezone().isoformat()}),
+        Author {getuser().capitalize()}, Language {getdefaultlocale()[0]}.
+        """.encode("utf-8"))
+    with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED,
+                         compresslevel=level) as log_zip:
+        log_zip.comment = zip_comment
+        log_zip.write(origin.as_posix(), arcname=origin.name)
+
+
+def _compress_gzip(origin: Path, target: Path, level: int) -> None:
+    """Compress origin to target GZip."""
+    with open(origin, "rb") as log_file, gzip.open(
+            target, "wb", compresslevel=9 if level is None else level) as gz:
+        shutil.copyfileobj(log_file, gz)
+
+
+def _compress_lzma(origin: Path, target: Path, level: int) -> None:
+    """Compress origin to target LZMA XZ."""
+    with open(origin, "rb") as log_file, lzma.open(
+            target, "wb", preset=level) as xz:
+        shutil.copyfileobj(log_file, xz)
+
+
+# Codec name -> (file extension, compress function), None does not compress.
+_CODECS = {"zip": (".zip", _compress_zip), "gzip": (".gz", _compress_gzip),
+           "lzma": (".xz", _compress_lzma), None: ("", None)}
+
+
+class _ZipRotator(object):
+
+    """Log Rotator with ZIP, GZip or LZMA compression on a background Thread.
+
+    Rotation only renames the log, while the handler lock is held,
+    then 1 background Thread compresses it and deletes the uncompressed log,
+    pending compressions are finished at exit."""
+    __slots__ = ("codec", "level", "executor")
+
+    def __init__(self, codec: str="zip", level: int=None):
+        """Init the Rotator with a codec and its compression level."""
+        codec = None if str(codec).lower() == "none" else codec
+        if codec not in _CODECS:
+            raise ValueError(f"Invalid codec {codec}, valid: {tuple(_CODECS)}")
+        object.__setattr__(self, "codec", codec)
+        object.__setattr__(self, "level", level)
+        object.__setattr__(self, "executor", ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="angler") if codec else None)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {self.codec} {self.level}>"
+
+    def __call__(self, origin, target):
+        """Rename origin log to target, compress it in the background."""
+        if not os.path.exists(origin):  # A file may not exist if delay.
+            return None
+        os.replace(origin, target)
+        if self.executor:
+            self.executor.submit(self._compress, Path(target))
+        return str(target)
+
+    def _compress(self, origin: Path) -> Path:
+        """Compress origin to origin plus codec extension, delete origin."""
+        extension, compress = _CODECS[self.codec]
+        target = origin.with_name(origin.name + extension)
+        temporary = origin.with_name(origin.name + extension + ".tmp")
+        try:
+            compress(origin, temporary, self.level)
+            os.replace(temporary, target)
+            origin.unlink()
+        except Exception as reason:
+            print(reason, file=sys.stderr)  # Do not use log here.
+            return None
+        return target
+
+    def wait(self) -> None:
+        """Wait until all the pending compressions are done."""
+        if self.executor:
+            self.executor.submit(int).result()
+
+    def __setattr__(self, *args, **kwargs):
+        raise TypeError("Internal _ZipRotator object is inmmutable read-only.")
+
+    def __delattr__(self, *args, **kwargs):
+        raise TypeError("Internal _ZipRotator object is inmmutable read-only.")
+
+
+class SizedTimedRotatingFileHandler(TimedRotatingFileHandler):
+
+    """TimedRotatingFileHandler with added file size based rotation.
+
+    The size of the file is tracked on stream_size, counting the bytes of each
+    record written, re-synced from the file when the stream is opened, so its
+    not needed to format records twice nor to seek the stream on each emit."""
+    __slots__ = ("filename", "maxMegaBytes", "backupCount",
+                 "delay", "when", "interval", "utc", "atTime", "stream_size")
+
+    def __init__(self, filename, maxMegaBytes=0, backupCount=0,
+                 delay=0, when='h', interval=1, utc=False, atTime=None):
+        """Overwrite the method shouldRollover."""
+        self.stream_size = 0  # Bytes on the file, _open() may be called now.
+        TimedRotatingFileHandler.__init__(
+            self, filename=filename, when=when, interval=interval,
+            backupCount=backupCount, encoding="utf-8", delay=delay, utc=utc)
+        self.maxMegaBytes = int(abs(maxMegaBytes))  # Extra class attribute.
+
+    def _open(self):
+        """Open the stream and re-sync the size from the file."""
+        stream = TimedRotatingFileHandler._open(self)
+        self.stream_size = os.fstat(stream.fileno()).st_size
+        return stream
+
+    def shouldRollover(self, record, size: int=0):
+        """Determine if rollover should occur, size is bytes to be written."""
+        if self.maxMegaBytes > 0:  # Are we rolling over?.
+            if self.stream_size + size > self.maxMegaBytes * 1024 * 1024:
+                return 1
+        t = int(time.time())
+        if t >= self.rolloverAt:
+            return 1
+        return 0
+
+    def emit(self, record):
+        """Emit a record, formatted only once, count the bytes written."""
+        try:
+            msg = self.format(record) + self.terminator
+            size = len(msg.encode("utf-8"))
+            if self.stream is None:  # Delay was set.
+                self.stream = self._open()
+            if self.shouldRollover(record, size):
+                self.doRollover()
+            if self.stream is None:  # Delay was set, rolled over.
+                self.stream = self._open()
+            self.stream.write(msg)
+            self.flush()
+            self.stream_size += size
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class _QueueListener(QueueListener):
+
+    """QueueListener that waits for room on the Queue to stop, never drops."""
+
+    def enqueue_sentinel(self):
+        """Put the sentinel blocking, a full Queue gets flushed before stop."""
+        self.queue.put(self._sentinel)
+
+
+class BoundedQueueHandler(QueueHandler):
+
+    """QueueHandler with a background QueueListener that owns the handlers.
+
+    Logging on the hot path only puts the record on the Queue, the listener
+    Thread does all the file, syslog and terminal I/O. If the Queue is bounded
+    and full the record is dropped and counted, never blocks the caller,
+    dropped and backlogged records get reported as WARNING log records."""
+
+    def __init__(self, handlers: tuple, queue_size: int=0):
+        """Init the Queue, the Listener and the drop and backlog counters."""
+        QueueHandler.__init__(self, Queue(int(abs(queue_size))))
+        self.listener = _QueueListener(
+            self.queue, *handlers, respect_handler_level=True)
+        self.dropped, self.backlogged, self.running = 0, False, False
+        self.high_water = self.queue.maxsize * 3 // 4  # 0 means unbounded.
+
+    def _report(self, name: str, msg: str) -> logging.LogRecord:
+        """Make a WARNING record to report about the Queue itself."""
+        return logging.makeLogRecord({
+            "name": name, "levelno": logging.WARNING, "msg": msg,
+            "levelname": logging.getLevelName(logging.WARNING)})
+
+    def _report_dropped(self, name: str) -> logging.LogRecord:
+        """Make a WARNING record to report the dropped records."""
+        return self._report(name, (
+            f"Dropped {self.dropped} log records, queue is full "
+            f"({self.queue.maxsize} records)."))
+
+    def enqueue(self, record):
+        """Put record on the Queue without blocking, count it if dropped."""
+        try:
+            if self.dropped:
+                self.queue.put_nowait(self._report_dropped(record.name))
+                self.dropped = 0
+            if self.high_water and self.queue.qsize() >= self.high_water:
+                if not self.backlogged:
+                    self.backlogged = True
+                    self.queue.put_nowait(self._report(record.name, (
+                        f"Backlog of {self.queue.qsize()} log records "
+                        f"queued of {self.queue.maxsize} records.")))
+            else:
+                self.backlogged = False
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+
+    def start(self):
+        """Start the background listener Thread, stop it at exit."""
+        self.listener.start()
+        self.running = True
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Flush all queued records and stop the background listener."""
+        self.acquire()
+        try:
+            if self.running:
+                self.listener.stop()
+                self.running = False
+                if self.dropped:  # Listener stopped, handle it directly.
+                    self.listener.handle(self._report_dropped("root"))
+                    self.dropped = 0
+        finally:
+            self.release()
+
+    def close(self):
+        """Stop the background listener and close the handler."""
+        self.stop()
+        QueueHandler.close(self)
+
+
+class JSONFormatter(logging.Formatter):
+
+    """Newline-delimited JSON Formatter, 1 JSON object per log record.
+
+    Keys are the same fields of _LOG_FORMAT, pre-built once on a template,
+    per record only the values get escaped, uses uJSON if installed."""
+    fields = ("asctime", "levelname", "processName", "process", "threadName",
+              "thread", "name", "funcName", "message", "pathname", "lineno")
+
+    def __init__(self, datefmt: str=_LOG_DATEFMT):
+        """Init the Formatter, build the JSON template from fields."""
+        logging.Formatter.__init__(self, datefmt=datefmt)
+        self.template = "{" + ", ".join(
+            f"{json_string(_)}: %s" for _ in self.fields)
+
+    def format(self, record):
+        """Format record as 1 line of JSON."""
+        record.message = record.getMessage()
+        record.asctime = self.formatTime(record, self.datefmt)
+        process, thread = record.process, record.thread  # None if disabled.
+        line = self.template % (
+            json_string(record.asctime), json_string(record.levelname),
+            json_string(record.processName or ""),
+            "null" if process is None else process,
+            json_string(record.threadName or ""),
+            "null" if thread is None else thread,
+            json_string(record.name), json_string(record.funcName or ""),
+            json_string(record.message), json_string(record.pathname),
+            record.lineno)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            line += ', "exc_text": ' + json_string(record.exc_text)
+        if record.stack_info:
+            line += ', "stack_info": ' + json_string(
+                self.formatStack(record.stack_info))
+        return line + "}"
+
+
+class ColoredFormatter(logging.Formatter):
+
+    """Formatter with ANSI Colors by level, and optional Kitten Emoji.
+
+    The Colors and Emoji for each level are looked up once and cached,
+    the record is not copied nor modified, only the formatted message."""
+    levels = (
+        (50, "\x1b[31;5;7m\n ",  # blinking red with black
+         (" 😿\n", " 🙀\n", " 💩\n", " ☠\n", "")),
+        (40, "\x1b[31m", (" 😾 ", " 😼 ", "")),  # red
+        (30, "\x1b[33m", (" 😺 ", " 😻 ", "")),  # yellow
+        (20, "\x1b[32m", (" 😸 ", " 😽 ", "")),  # green
+        (10, "\x1b[35m", (" 🐱 ", " 😹 ", "")),  # pink
+        (0, "\x1b[0m", ()),  # normal
+    )
+
+    def __init__(self, fmt: str=None, datefmt: str=None, emoji: bool=False):
+        """Init the Formatter, cache Colors and Emoji for standard levels."""
+        logging.Formatter.__init__(self, fmt=fmt, datefmt=datefmt)
+        self.emoji, self.colors = emoji, {}  # levelno: (color, endings).
+        for levelno, _, _ in self.levels:
+            self._get_color(levelno)
+
+    def _get_color(self, levelno: int) -> tuple:
+        """Get the Color and the possible endings for levelno, cache it."""
+        for threshold, color, emojis in self.levels:
+            if levelno >= threshold:
+                break
+        endings = tuple(" \x1b[0m" + _ for _ in emojis if self.emoji)
+        self.colors[levelno] = color, endings or (" \x1b[0m", )
+        return self.colors[levelno]
+
+    def formatMessage(self, record):
+        """Format the message with the Color and ending for its level."""
+        color, endings = (self.colors.get(record.levelno) or
+                          self._get_color(record.levelno))
+        ending = choice(endings) if len(endings) > 1 else endings[0]
+        return color + logging.Formatter.formatMessage(self, record) + ending
+
+
+class RateLimitFilter(logging.Filter):
+
+    """Filter that Rate Limits similar log records with a Token Bucket.
+
+    Similar records have the same logger name, level and message template,
+    each gets rate records per second with bursts of up to burst records,
+    every interval seconds a summary of the suppressed records is logged.
+    1 instance can be shared by many handlers, a record is counted once."""
+
+    def __init__(self, rate: float=10, burst: int=None, interval: int=60):
+        """Init the Filter, the Token Buckets and the summary timer."""
+        logging.Filter.__init__(self)
+        self.rate, self.burst = rate, burst or max(int(rate), 1)
+        self.interval, self.buckets, self.lock = interval, {}, threading.Lock()
+        self.next_summary = time.monotonic() + interval
+
+    def filter(self, record):
+        """Return True if the record is allowed, False if suppressed."""
+        ratelimited = getattr(record, "ratelimited", None)
+        if ratelimited is not None:  # Already seen by another handler.
+            return not ratelimited
+        key = (record.name, record.levelno, str(record.msg))
+        now, summaries = time.monotonic(), ()
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:  # [tokens, last time, suppressed count].
+                bucket = self.buckets[key] = [self.burst, now, 0]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            ratelimited = tokens < 1
+            if ratelimited:
+                bucket[2] += 1
+            else:
+                tokens -= 1
+            bucket[0], bucket[1] = tokens, now
+            if now >= self.next_summary:
+                summaries = self._summaries(now)
+        record.ratelimited = ratelimited
+        self._log(summaries)
+        return not ratelimited
+
+    def _summaries(self, now: float) -> list:
+        """Make summary records of suppressed records, forget idle buckets."""
+        summaries, self.next_summary = [], now + self.interval
+        for key, bucket in tuple(self.buckets.items()):
+            if bucket[2]:
+                summaries.append(logging.makeLogRecord({
+                    "name": key[0], "levelno": key[1], "ratelimited": False,
+                    "funcName": self.__class__.__name__,
+                    "levelname": logging.getLevelName(key[1]),
+                    "msg": "Suppressed %s similar log records: %r.",
+                    "args": (bucket[2], key[2])}))
+                bucket[2] = 0
+            elif now - bucket[1] > self.interval:
+                del self.buckets[key]
+        return summaries
+
+    def _log(self, summaries: list) -> None:
+        """Log the summary records, on the logger of the similar records."""
+        for summary in summaries:
+            logging.getLogger(None if summary.name == "root" else
+                              summary.name).handle(summary)
+
+    def flush(self) -> None:
+        """Log the summary of the suppressed records right now."""
+        with self.lock:
+            summaries = self._summaries(time.monotonic())
+        self._log(summaries)
+
+
+##############################################################################
+
+
+def _get_formatter(jsony: bool) -> logging.Formatter:
+    """Formatter for plain text or newline-delimited JSON."""
+    if jsony:
+        return JSONFormatter(datefmt=_LOG_DATEFMT)
+    return logging.Formatter(fmt=_LOG_FORMAT, datefmt=_LOG_DATEFMT)
+
+
+def _get_handler(filename: str, when: str, interval: int, delay: bool,
+                 utc: bool, backupCount: int, atTime: bool, maxMegaBytes: int,
+                 level: int, compression: str, compresslevel: int,
+                 jsony: bool) -> SizedTimedRotatingFileHandler:
+    """Handler with Rotator and Renamer."""
+    handler = SizedTimedRotatingFileHandler(
+        filename=filename, when=when, interval=interval, delay=delay, utc=utc,
+        backupCount=backupCount, atTime=atTime, maxMegaBytes=maxMegaBytes)
+    handler.setLevel(level or -1)
+    handler.setFormatter(_get_formatter(jsony))
+    handler.rotator = _ZipRotator(compression, compresslevel)
+    return handler
+
+
+def _add_stderr(stder: bool, jsony: bool, colored: bool,
+                emoji: bool) -> object:
+    """Add standard error to the logger log."""
+    if not stder:
+        return None
+    handler = logging.StreamHandler(sys.stderr)
+    if jsony:
+        handler.setFormatter(_get_formatter(jsony))
+    elif colored:
+        handler.setFormatter(ColoredFormatter(emoji=emoji))
+    return handler
+
+
+def _add_queue(handlers: list, queue_size: int) -> BoundedQueueHandler:
+    """Add a Queue to the logger log, a background Thread does all the I/O."""
+    handler = BoundedQueueHandler(handlers, queue_size=queue_size)
+    handler.start()
+    return handler
+
+
+def _add_ratelimit(ratelimit: float) -> RateLimitFilter:
+    """Add a Rate Limit to the logger log, summary of suppressed at exit."""
+    if not ratelimit:
+        return None
+    ratelimit_filter = RateLimitFilter(rate=ratelimit)
+    atexit.register(ratelimit_filter.flush)
+    return ratelimit_filter
+
+
+def _add_faulthandler(crashandler: object) -> object:
+    """Add faulthandler to the logger log."""
+    return faulthandler.enable(crashandler) if crashandler else None
+
+
+def _add_syslog(slog: bool, jsony: bool) -> object:
+    """Add Syslog to the logger log."""
+    if Path("/dev/log").exists() or Path("/var/run/syslog").exists() and slog:
+        is_linux = sys.platform.startswith("linux")
+        addrss = Path("/dev/log" if is_linux else "/var/run/syslog").as_posix()
+        try:
+            handler = logging.handlers.SysLogHandler(address=str(addrss))
+            handler.setFormatter(_get_formatter(jsony))
+        except Exception:
+            return None
+        else:
+            return handler
+
+
+def make_logger(name, when='midnight', filename=None, interval=1,
+                backupCount=100, delay=False, utc=False,
+                atTime=None, level=-1, slog=True, stder=True, crashandler=None,
+                emoji=False, color=True, maxMegaBytes=1, process_defaults=True,
+                queued=False, queue_size=0, compression='zip',
+                compresslevel=None, jsony=False, ratelimit=0, *args, **kwargs):
+    """Build and return a Logging Logger."""
+    global log
+    if process_defaults:  # No Bytecode cache and default SIGINT, as before.
+        set_process_defaults()
+    if not filename:
+        filename = str(gettempdir() / Path(name.lower() + ".log"))
+    # Handler with Rotator and Renamer.
+    sized_timed_rotating_file_handler = _get_handler(
+        filename=filename, when=when, interval=interval,
+        delay=delay, utc=utc, backupCount=backupCount,
+        atTime=atTime, maxMegaBytes=maxMegaBytes, level=level,
+        compression=compression, compresslevel=compresslevel, jsony=jsony)
+    handlers = [sized_timed_rotating_file_handler]
+    # Init a logger.
+    log = logging.getLogger()
+    log.setLevel(level or -1)
+    # Colors and Emoji.
+    colored = (not sys.platform.startswith("win") and sys.stderr.isatty()
+               and not jsony and color)  # ANSI colors would break the JSON.
+    # Standard Error handler.
+    stder_handler = _add_stderr(stder=stder, jsony=jsony, colored=colored,
+                                emoji=emoji)
+    if stder_handler:
+        handlers.append(stder_handler)
+    # SysLog handler.
+    syslog_handler = _add_syslog(slog, jsony)
+    if syslog_handler:
+        handlers.append(syslog_handler)
+    # Queue handler, non-blocking, the background Thread owns the handlers.
+    queue_handler = _add_queue(handlers, queue_size) if queued else None
+    # Rate Limit filter, 1 shared by all handlers, before the Queue if any.
+    ratelimit_filter = _add_ratelimit(ratelimit)
+    for handler in (queue_handler, ) if queue_handler else handlers:
+        if ratelimit_filter:
+            handler.addFilter(ratelimit_filter)
+        log.addHandler(handler)
+    if colored and stder_handler:
+        log.debug("Colored Logs on current Terminal enabled.")
+    # Fault handler.
+    crash_handler = _add_faulthandler(crashandler)
+
+    log.debug(f"""Logger created by Angler.
+        Plain text Log Files at: {filename}       ({filename!r}).
+        Compressing Log Rotator: {sized_timed_rotating_file_handler.rotator}.
+        SysLog handler (if any): {syslog_handler} ({syslog_handler!r}).
+        Faults/Crashes handlers: {crash_handler}  ({crash_handler!r}).
+        Standard Error handlers: {crash_handler}  ({crash_handler!r}).
+        Queue handler (if any):  {queue_handler}  ({queue_handler!r}).
+        Rate Limit (if any):     {ratelimit_filter}  ({ratelimit}/second).
+        Sized+Timed Rotating File Handler: {sized_timed_rotating_file_handler}.
+    """)
+    return log
@@ -6,87 +6,359 @@
 
 
 import multiprocessing
+import os
 import sys
+from collections import deque, namedtuple
 from concurrent import futures
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import suppress
+from functools import lru_cache, partial
+from itertools import islice
+from multiprocessing.shared_memory import SharedMemory
+from queue import Empty, SimpleQueue
 
 
-__all__ = ("multiprocessed", )
+__all__ = ("multiprocessed", "MultiProcessExecutor", "SharedBuffer")
+
+
+_WORKER = {}  # State of each worker Process, set by _init_worker.
+_SharedResult = namedtuple("_SharedResult", "name size")  # Worker -> Parent.
+
+
+class SharedBuffer(object):
+
+    """Buffer on shared memory, pickled as its name only, zero-copy.
+
+    The Process that creates it owns it and unlinks it on close,
+    other Processes attach to it when unpickled, slices share its memory,
+    the owner must be alive while its slices are in use."""
+    __slots__ = ("name", "offset", "size", "owner", "_memory")
+
+    def __init__(self, data=None, size: int=0, name: str=None,
+                 offset: int=0, owner: bool=None):
+        if name is None:  # Create a new one, with a copy of data if any.
+            data = None if data is None else memoryview(data).cast("B")
+            size = size if data is None else data.nbytes
+            self._memory = SharedMemory(create=True, size=max(size, 1))
+            if data is not None:
+                self._memory.buf[:size] = data
+        else:  # Attach to an existing one, by its name.
+            self._memory = SharedMemory(name=name)
+        self.name, self.offset, self.size = self._memory.name, offset, size
+        self.owner = name is None if owner is None else owner
+
+    def __reduce__(self):
+        return (SharedBuffer, (None, self.size, self.name, self.offset, False))
+
+    def __repr__(self):
+        return "<{0}: name={1}, offset={2}, size={3}, owner={4}>".format(
+            self.__class__.__name__, self.name, self.offset, self.size,
+            self.owner)
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index: slice) -> "SharedBuffer":
+        start, stop, step = index.indices(self.size)
+        if step != 1:
+            raise ValueError("SharedBuffer slices must be contiguous.")
+        view = object.__new__(SharedBuffer)
+        view.name, view.offset, view.size = (
+            self.name, self.offset + start, max(stop - start, 0))
+        view.owner, view._memory = False, self._memory
+        return view
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.close()
+
+    def __del__(self):
+        if getattr(self, "owner", False):
+            self.close()
+
+    @property
+    def buf(self) -> memoryview:
+        """memoryview of the shared memory, no copy."""
+        return self._memory.buf[self.offset:self.offset + self.size]
+
+    def tobytes(self) -> bytes:
+        """Copy of the shared memory as bytes."""
+        return self.buf.tobytes()
+
+    def close(self) -> None:
+        """Detach from the shared memory, the owner also unlinks it."""
+        with suppress(BufferError):  # Memoryviews still in use, GC unmaps.
+            self._memory.close()
+        if self.owner:
+            self.owner = False
+            with suppress(FileNotFoundError):
+                self._memory.unlink()
+
+
+def _share(item, shared_memory: int=0):
+    """Copy 1 buffer item to a new SharedBuffer if its big, else the item."""
+    if shared_memory and not isinstance(item, SharedBuffer):
+        try:
+            view = memoryview(item)
+        except TypeError:
+            return item  # Not a buffer, pickled as always.
+        if view.nbytes >= shared_memory:
+            return SharedBuffer(view)
+    return item
+
+
+def _share_result(result, shared_memory: int=0):
+    """Copy 1 buffer result to shared memory if its big, owned by Parent."""
+    if shared_memory:
+        try:
+            view = memoryview(result)
+        except TypeError:
+            return result
+        if view.nbytes >= shared_memory:
+            memory = SharedMemory(create=True, size=view.nbytes)
+            memory.buf[:view.nbytes] = view.cast("B")
+            memory.close()  # Not unlinked, the Parent adopts it.
+            return _SharedResult(memory.name, view.nbytes)
+    return result
+
+
+def _adopt(result):
+    """Get a SharedBuffer owned by this Process from a shared result."""
+    if isinstance(result, _SharedResult):
+        return SharedBuffer(None, result.size, result.name, owner=True)
+    return result
+
+
+def _call_shared(function, item, shared_memory: int=0):
+    """Call the function with 1 item, a SharedBuffer item as memoryview."""
+    if not isinstance(item, SharedBuffer):
+        return _share_result(function(item), shared_memory)
+    view = item.buf
+    try:
+        return _share_result(function(view), shared_memory)
+    finally:
+        with suppress(BufferError):
+            view.release()
+        item.close()  # Attached on unpickle, detach as soon as possible.
+
+
+def _close_all(shared_buffers: list, *args) -> None:
+    """Close and unlink all the SharedBuffer of 1 chunk, when its done."""
+    for shared_buffer in shared_buffers:
+        shared_buffer.close()
 
 
 class __MultiProcessed():
 
-    """Basic MultiProcessed class."""
+    """Basic MultiProcessed class, dynamic scheduling on small chunks."""
     __slots__ = ("cpu_num", "thread_num")
 
     def __init__(self, cpu_num: int, thread_num: int):
         self.cpu_num, self.thread_num = cpu_num, thread_num
 
-    def _multi_cpu(self, _func, job_queue: list, timeout: int) -> list:
-        if _getLen(job_queue) == 0:
-            return []
-        index = _get_index(job_queue, self.cpu_num)
-        cpu_pool = multiprocessing.Pool(processes=self.cpu_num)
-        mgr = multiprocessing.Manager()
-        process_bar = mgr.list()
-        for i in range(self.cpu_num):
-            process_bar.append(0)
-        result_queue = cpu_pool.map(
-            _multi_thread,
-            [[_func, self.cpu_num, self.thread_num,
-              job_queue[int(index[i][0]): int(index[i][1] + 1)],
-              timeout, process_bar, i]
-             for i in range(len(index))])
-        result = []
-        for rl in result_queue:
-            for r in rl:
-                result.append(r)
-        return result
-
+    def _get_chunksize(self, job_num: int) -> int:
+        """Get a small chunk size, ~32 chunks per Process, 1 job per Thread.
 
-def _func(argv):
-    argv[2][argv[3]] = round((argv[4] * 100.0 / argv[5]), 2)
-    sys.stdout.write(str(argv[2]) + ' ||' + '->' + "\r")
-    sys.stdout.flush()
-    return argv[0](argv[1])
+        Idle Processes take the next chunk from the shared queue, so a few
+        slow jobs do not leave the other Processes waiting for them."""
+        return max(self.thread_num, job_num // (self.cpu_num * 32), 1)
 
-
-def _multi_thread(argv):
-    thread_num = argv[2]
-    if _getLen(argv[3]) < thread_num:
-        thread_num = argv[3]
-    _func_argvs = [[argv[0], argv[3][i], argv[5], argv[6], i, len(argv[3])]
-                   for i in range(len(argv[3]))]
-    result = []
-    if thread_num == 1:
-        for _func_argv in _func_argvs:
-            result.append(_func(_func_argv))
+    def _multi_cpu(self, _func, job_queue: list, timeout: int,
+                   shared_memory: int=0, chunksize: int=None,
+                   executor: object=None) -> list:
+        job_num = _getLen(job_queue)
+        if job_num == 0:
+            return []
+        if executor is None:
+            executor = _get_executor(
+                self.cpu_num, self.thread_num, shared_memory)
+        chunksize = chunksize or self._get_chunksize(job_num)
+        result, start = [], executor.progress
+        try:
+            for r in executor.imap(_func, job_queue, chunksize, timeout):
+                result.append(r)
+                if len(result) % chunksize and len(result) < job_num:
+                    continue  # Progress is written once per chunk.
+                done = min(executor.progress - start, job_num)
+                sys.stdout.write(
+                    str(round(done * 100.0 / job_num, 2)) + " ||->\r")
+                sys.stdout.flush()
+        except BrokenProcessPool:
+            _get_executor.cache_clear()  # A worker died, start new ones.
+            raise
         return result
-    thread_pool = futures.ThreadPoolExecutor(max_workers=thread_num,
-                                             thread_name_prefix="angler")
-    result = thread_pool.map(_func, _func_argvs, timeout=argv[4])
-    return [r for r in result]
 
 
 def _getLen(_list: list) -> int:
     return 0 if _list is None else len(_list)
 
 
-def _get_index(job_queue: list, split_num: int) -> int:
-    job_num = _getLen(job_queue)
-    if job_num < split_num:
-        split_num = job_num
-    each_num = job_num / split_num
-    index = [[i * each_num, i * each_num + each_num - 1]
-             for i in range(split_num)]
-    residual_num = job_num % split_num
-    for i in range(residual_num):
-        index[split_num - residual_num + i][0] += i
-        index[split_num - residual_num + i][1] += i + 1
-    return index
+@lru_cache(maxsize=8)
+def _get_executor(cpu_num: int, thread_num: int,
+                  shared_memory: int=0) -> "MultiProcessExecutor":
+    """Get a MultiProcessExecutor reused by all multiprocessed() calls."""
+    return MultiProcessExecutor(cpu_num, thread_num, shared_memory)
 
 
 def multiprocessed(function, arguments: list, cpu_num: int=1,
-                   thread_num: int=1, timeout: int=None) -> __MultiProcessed:
-    """Run on multiple processes and threads the given callable."""
+                   thread_num: int=1, timeout: int=None,
+                   shared_memory: int=0, chunksize: int=None,
+                   executor: object=None) -> __MultiProcessed:
+    """Run on multiple processes and threads the given callable.
+
+    Jobs are scheduled dynamically, on chunks of chunksize jobs taken by
+    each Process when its idle, None for a small automatic chunksize.
+    If shared_memory, buffer arguments and results of at least shared_memory
+    bytes are passed as SharedBuffer on shared memory, not pickled.
+    The worker Processes are reused by the next calls with the same cpu_num,
+    thread_num and shared_memory, or by the MultiProcessExecutor executor."""
+    if executor is not None:
+        cpu_num, thread_num = executor.cpu_num, executor.thread_num
     multicpu_instance = __MultiProcessed(cpu_num, thread_num)
-    return multicpu_instance._multi_cpu(function, arguments, timeout)
+    return multicpu_instance._multi_cpu(
+        function, arguments, timeout, shared_memory, chunksize, executor)
+
+
+def _init_worker(counter, thread_num: int) -> None:
+    """Initialize 1 worker Process, once, with its shared counter."""
+    _WORKER["counter"] = counter
+    _WORKER["threads"] = futures.ThreadPoolExecutor(
+        max_workers=thread_num,
+        thread_name_prefix="angler") if thread_num > 1 else None
+
+
+def _run_chunk(function, chunk: tuple, shared_memory: int=0) -> list:
+    """Call the function with each item of 1 chunk, on a worker Process."""
+    threads, function = _WORKER.get("threads"), partial(
+        _call_shared, function, shared_memory=shared_memory)
+    if threads is None:
+        results = [function(_) for _ in chunk]
+    else:
+        results = list(threads.map(function, chunk))
+    counter = _WORKER.get("counter")
+    if counter is not None:
+        with counter.get_lock():  # 1 lock per chunk, not per item.
+            counter.value += len(chunk)
+    return results
+
+
+class MultiProcessExecutor(object):
+
+    """Persistent reusable Process Pool, streams results on chunks.
+
+    Worker Processes are started once and reused by all the calls,
+    items are sent on chunks of chunksize, at most 2 chunks per Process are
+    running, the iterable is consumed only when there is room, idle Processes
+    take the next chunk from the shared queue, dynamic scheduling.
+    progress is the count of items done, on a shared counter.
+    If shared_memory, buffer items and results of at least shared_memory
+    bytes are passed as SharedBuffer on shared memory, not pickled."""
+    __slots__ = ("cpu_num", "thread_num", "counter", "pool", "shared_memory")
+
+    def __init__(self, cpu_num: int=None, thread_num: int=1,
+                 shared_memory: int=0):
+        self.cpu_num = cpu_num or os.cpu_count() or 1
+        self.shared_memory = shared_memory
+        self.thread_num, self.counter = thread_num, multiprocessing.Value("Q")
+        self.pool = futures.ProcessPoolExecutor(
+            max_workers=self.cpu_num, initializer=_init_worker,
+            initargs=(self.counter, thread_num))
+
+    def __repr__(self):
+        return "<{0}: cpu_num={1}, thread_num={2}, progress={3}>".format(
+            self.__class__.__name__, self.cpu_num, self.thread_num,
+            self.progress)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.close()
+
+    @property
+    def progress(self) -> int:
+        """Count of items done by all the calls, since created."""
+        return self.counter.value
+
+    def _imap(self, function, iterable, chunksize: int, ordered: bool,
+              timeout: float):
+        """Yield function(item) for all the items, on chunks.
+
+        Any chunk done makes room for a new one, even if ordered and the
+        first chunk is still running, up to 32 chunks per Process buffered."""
+        iterator = iter(iterable)
+        chunks = iter(lambda: tuple(islice(iterator, max(1, chunksize))), ())
+        pending, completed = deque() if ordered else set(), deque()
+        add = pending.append if ordered else pending.add
+        finished, running = SimpleQueue(), 0  # Chunks done, from callbacks.
+
+        def fill() -> None:
+            nonlocal running
+            while (len(pending) < self.cpu_num * 32 and
+                   running < self.cpu_num * 2):
+                chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                shared = tuple(_share(_, self.shared_memory) for _ in chunk)
+                future = self.pool.submit(
+                    _run_chunk, function, shared, self.shared_memory)
+                future.add_done_callback(partial(_close_all, [  # Inputs.
+                    a for a, b in zip(shared, chunk) if a is not b]))
+                future.add_done_callback(finished.put)
+                add(future)
+                running += 1
+
+        def collect(block: bool) -> None:
+            """Count the chunks done, O(1) each, block until 1 if block."""
+            nonlocal running
+            while True:
+                try:
+                    future = finished.get(block, timeout)
+                except Empty:
+                    if block:
+                        raise futures.TimeoutError()
+                    return
+                running, block = running - 1, False
+                if not ordered:
+                    completed.append(future)
+
+        try:
+            while True:
+                collect(False)
+                fill()
+                if ordered and pending and pending[0].done():
+                    future = pending.popleft()
+                elif not ordered and completed:
+                    future = completed.popleft()
+                    pending.discard(future)
+                elif pending or running:
+                    collect(True)  # Wait for any chunk, not only the first.
+                    continue
+                else:
+                    break  # Nothing running and nothing left on iterable.
+                fill()  # Refill before yielding, Processes keep working.
+                yield from map(_adopt, future.result())
+        finally:
+            for future in pending:
+                future.cancel()  # Consumer stopped early or function failed.
+
+    def imap(self, function, iterable, chunksize: int=1,
+             timeout: float=None):
+        """Yield function(item) for all the items, on the iterable order."""
+        return self._imap(function, iterable, chunksize, True, timeout)
+
+    def imap_unordered(self, function, iterable, chunksize: int=1,
+                       timeout: float=None):
+        """Yield function(item) for all the items, as completed."""
+        return self._imap(function, iterable, chunksize, False, timeout)
+
+    def map(self, function, iterable, chunksize: int=1,
+            timeout: float=None) -> list:
+        """Return a list of function(item) for all the items, in order."""
+        return list(self.imap(function, iterable, chunksize, timeout))
+
+    def close(self, wait: bool=True) -> None:
+        """Shutdown the worker Processes."""
+        self.pool.shutdown(wait=wait)
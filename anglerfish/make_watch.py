@@ -2,33 +2,554 @@
 # -*- coding: utf-8 -*-
 
 
-"""Watch a file path for changes run callback if modified. A WatchDog."""
+"""Watch a file path for changes run callback if modified. A WatchDog.
 
+On Linux uses inotify via ctypes, blocks until a change without wakeups,
+else polls the file modification time on nanoseconds and size.
+Watcher watches many files and folders on 1 Thread with 1 inotify.
+awatch and awatch_changes are for asyncio, woken by loop.add_reader."""
 
+
+import asyncio
+import inspect
+import logging as log
 import os
+import struct
+import sys
+import threading
 import time
+import warnings
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from ctypes import CDLL, get_errno
+from functools import lru_cache, partial
+from select import select
+from weakref import WeakKeyDictionary
+
+
+_IN_MODIFY, _IN_ATTRIB, _IN_CLOSE_WRITE = 0x2, 0x4, 0x8
+_IN_MOVED_FROM, _IN_MOVED_TO, _IN_CREATE, _IN_DELETE = 0x40, 0x80, 0x100, 0x200
+_IN_DELETE_SELF, _IN_MOVE_SELF, _IN_Q_OVERFLOW = 0x400, 0x800, 0x4000
+_IN_CHANGES = (_IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM |
+               _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF |
+               _IN_MOVE_SELF)
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len, then name[len].
+
+
+@lru_cache(maxsize=1)
+def _get_libc() -> object:
+    """Get the libc with inotify, None if not Linux or not available."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = CDLL("libc.so.6", use_errno=True)
+        libc.inotify_init1, libc.inotify_add_watch, libc.inotify_rm_watch
+    except (OSError, AttributeError):
+        return None  # musl or other libc, inotify not available.
+    return libc
+
+
+class _Inotify(object):
+
+    """Minimal inotify via ctypes, non-blocking, closed on exec."""
+    __slots__ = ("libc", "fd")
+
+    def __init__(self):
+        self.libc = _get_libc()
+        if self.libc is None:
+            raise OSError("inotify is not available on this OS.")
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(get_errno(), os.strerror(get_errno()))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args, **kwargs):
+        self.close()
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def add_watch(self, path: str, mask: int=_IN_CHANGES) -> int:
+        """Watch a file or folder, return its watch descriptor."""
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(get_errno(), os.strerror(get_errno()), path)
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        """Stop watching a watch descriptor, ignore if already removed."""
+        self.libc.inotify_rm_watch(self.fd, wd)
+
+    def wait(self, timeout: float=None) -> bool:
+        """Block until there are events or timeout, return True if events."""
+        return bool(select((self.fd, ), (), (), timeout)[0])
+
+    def read(self) -> list:
+        """Read all the pending events, as a list of (wd, mask, name)."""
+        try:
+            buffer = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return []
+        events, offset = [], 0
+        while offset < len(buffer):
+            wd, mask, _, size = _EVENT.unpack_from(buffer, offset)
+            offset += _EVENT.size
+            events.append((wd, mask, os.fsdecode(
+                buffer[offset:offset + size].rstrip(b"\0"))))
+            offset += size
+        return events
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def _signature(file_path: str) -> tuple:
+    """Get modification time on nanoseconds and size, None if not exists."""
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None  # Deleted, or replaced by an editor right now.
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _signature_folder(folder: str) -> frozenset:
+    """Get name, mtime_ns and size of all entries of folder, for polling."""
+    signature = set()
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                signature.add((entry.name, stat.st_mtime_ns, stat.st_size))
+    except FileNotFoundError:
+        return None
+    return frozenset(signature)
+
+
+def _remaining(end_time: float) -> float:
+    """Get the seconds remaining until end_time, raise TimeoutError if 0."""
+    if end_time is None:
+        return None
+    remaining = end_time - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("Timeout while watching for changes.")
+    return remaining
+
+
+def _watch_poll(file_path: str, previous: tuple, interval: int=60,
+                backoff: int=1, end_time: float=None) -> None:
+    """Poll file path until its modification time or size changes."""
+    while True:
+        actual = _signature(file_path)
+        if actual is not None and actual != previous:
+            return
+        remaining = _remaining(end_time)
+        time.sleep(min(abs(interval), remaining or abs(interval)))
+        interval *= backoff if backoff and backoff in range(1, 9) else 1
+
+
+def _split_watched(file_path: str) -> tuple:
+    """Get the folder to watch and the name to match, None for any name.
+
+    Files are watched on its folder, so files replaced by editors with a
+    rename are also detected, folders are watched on itself."""
+    file_path = os.path.abspath(file_path)
+    if os.path.isdir(file_path):
+        return file_path, None
+    return os.path.split(file_path)
+
+
+def _watch_inotify(file_path: str, previous: tuple,
+                   end_time: float=None) -> None:
+    """Block on inotify until file path changes."""
+    folder, name = _split_watched(file_path)
+    with _Inotify() as inotify:
+        inotify.add_watch(folder)
+        while True:
+            actual = _signature(file_path)  # Changed before the add_watch?.
+            if actual is not None and actual != previous:
+                return
+            while not any(name in (None, _[2]) or _[1] & _IN_Q_OVERFLOW
+                          for _ in inotify.read()):
+                inotify.wait(_remaining(end_time))
+
+
+def _get_backend(backend: str="auto") -> str:
+    """Validate backend, resolve 'auto' to inotify if available, else poll."""
+    if backend not in ("auto", "inotify", "poll"):
+        raise ValueError(
+            f"Invalid backend {backend}, valid: ('auto', 'inotify', 'poll')")
+    if backend == "auto":
+        backend = "inotify" if _get_libc() else "poll"
+    return backend
+
+
+class Watcher(object):
+
+    """Watch many files and folders for changes, run its callbacks.
+
+    All paths are watched by 1 Thread, blocking on 1 inotify on Linux,
+    else polling all paths every interval seconds. A burst of changes on a
+    path runs its callback(path) once, debounce seconds after the last one.
+    Callbacks run on a Thread Pool of max_workers Threads, at most 1 at a
+    time for each path, so pending callbacks never exceed the paths."""
+    __slots__ = ("interval", "debounce", "backend", "logger", "callbacks",
+                 "folders", "signatures", "pending", "running", "lock",
+                 "pool", "thread", "stopped", "inotify", "wds", "wake",
+                 "watched", "watches")
+
+    def __init__(self, interval: float=1, debounce: float=0.1,
+                 max_workers: int=4, backend: str="auto",
+                 logger: object=None):
+        self.interval, self.debounce = interval, debounce
+        self.backend, self.logger = _get_backend(backend), logger or log
+        self.callbacks, self.folders, self.signatures = {}, set(), {}
+        self.pending, self.running, self.lock = {}, set(), threading.Lock()
+        self.pool = ThreadPoolExecutor(max_workers=max_workers,
+                                       thread_name_prefix="angler")
+        self.thread, self.stopped = None, threading.Event()
+        self.inotify, self.wds, self.wake = None, {}, None
+        self.watched, self.watches = {}, Counter()  # path->wd, wd->paths.
+        if self.backend == "inotify":
+            self.inotify, self.wake = _Inotify(), os.pipe()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args, **kwargs):
+        self.stop()
+
+    def add(self, path: str, callback) -> None:
+        """Watch a file or folder path, run callback(path) when it changes.
+
+        Folders are changed when any of its files is added, removed or
+        modified, files when its modification time or size changes."""
+        path = os.path.abspath(path)
+        is_folder = os.path.isdir(path)
+        with self.lock:
+            self.callbacks[path] = callback
+            if is_folder:
+                self.folders.add(path)
+            if self.inotify is None:
+                self.signatures[path] = (_signature_folder(path) if is_folder
+                                         else _signature(path))
+            elif not is_folder:
+                self.signatures[path] = _signature(path)
+            if self.inotify is not None and path not in self.watched:
+                folder = path if is_folder else os.path.dirname(path)
+                wd = self.inotify.add_watch(folder)  # Same folder, same wd.
+                self.wds[wd], self.watched[path] = folder, wd
+                self.watches[wd] += 1
+
+    def remove(self, path: str) -> None:
+        """Stop watching a file or folder path.
+
+        The inotify watch of its folder is removed with its last path."""
+        path = os.path.abspath(path)
+        with self.lock:
+            self.callbacks.pop(path, None)
+            self.signatures.pop(path, None)
+            self.pending.pop(path, None)
+            self.folders.discard(path)
+            wd = self.watched.pop(path, None)
+            if wd is not None:
+                self.watches[wd] -= 1
+                if not self.watches[wd]:
+                    del self.watches[wd], self.wds[wd]
+                    self.inotify.rm_watch(wd)
+
+    def start(self) -> "Watcher":
+        """Start watching on a new Thread, return the Watcher."""
+        if self.thread is None:
+            self.thread = threading.Thread(
+                target=self._run, name="angler-watcher", daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop watching, wait for the running callbacks, close the Watcher."""
+        self.stopped.set()
+        if self.wake is not None:
+            os.write(self.wake[1], b"\0")
+        if self.thread is not None:
+            self.thread.join()
+        self.pool.shutdown(wait=True)
+        if self.inotify is not None:
+            self.inotify.close()
+            for fd in self.wake:
+                os.close(fd)
+            self.inotify = self.wake = None
+
+    def _run(self) -> None:
+        next_poll = time.monotonic() + self.interval
+        while not self.stopped.is_set():
+            timeout = self._dispatch()
+            if self.inotify is not None:
+                self._wait_inotify(timeout)
+                continue
+            wait = next_poll - time.monotonic()
+            if wait <= 0:
+                self._poll()
+                next_poll = time.monotonic() + self.interval
+                continue
+            self.stopped.wait(wait if timeout is None else min(wait, timeout))
+
+    def _touch(self, path: str) -> None:
+        """Mark path as changed, debouncing, its callback runs later."""
+        self.pending[path] = time.monotonic() + self.debounce
+
+    def _poll(self) -> None:
+        with self.lock:
+            for path in tuple(self.callbacks):
+                actual = (_signature_folder(path) if path in self.folders
+                          else _signature(path))
+                if actual != self.signatures[path]:
+                    self.signatures[path] = actual
+                    if actual is not None:
+                        self._touch(path)
+
+    def _wait_inotify(self, timeout: float=None) -> None:
+        ready = select((self.inotify.fd, self.wake[0]), (), (), timeout)[0]
+        if self.wake[0] in ready:
+            os.read(self.wake[0], 512)
+        events = self.inotify.read()
+        with self.lock:
+            for wd, mask, name in events:
+                if mask & _IN_Q_OVERFLOW:  # Events lost, check all paths.
+                    for path in self.callbacks:
+                        self._touch(path)
+                    continue
+                folder = self.wds.get(wd)
+                if folder in self.folders:
+                    self._touch(folder)
+                path = os.path.join(folder, name) if folder and name else None
+                if path in self.callbacks:
+                    self._touch(path)
+
+    def _dispatch(self) -> float:
+        """Run the callbacks of paths debounced, return seconds until next."""
+        now, timeout, futures = time.monotonic(), None, []
+        with self.lock:
+            for path, deadline in tuple(self.pending.items()):
+                if deadline <= now and path in self.running:  # Run later.
+                    deadline = self.pending[path] = now + self.debounce
+                if deadline > now:
+                    timeout = min(deadline - now, timeout or float("inf"))
+                    continue
+                del self.pending[path]
+                if self.inotify is not None and path not in self.folders:
+                    actual = _signature(path)  # Not all events are changes.
+                    if actual is None or actual == self.signatures[path]:
+                        continue
+                    self.signatures[path] = actual
+                self.running.add(path)
+                futures.append((path, self.pool.submit(
+                    self.callbacks[path], path)))
+        for path, future in futures:  # Runs now if done, out of the lock.
+            future.add_done_callback(partial(self._done, path))
+        return timeout
+
+    def _done(self, path: str, future) -> None:
+        with self.lock:
+            self.running.discard(path)
+        if future.exception() is not None:
+            self.logger.error(f"Watcher callback for {path} failed: "
+                              f"{future.exception()!r}.")
 
 
 def watch(file_path: str, callback=None, interval: int=60,
-          backoff: int=1, timeout: int=None, repetitions: int=-1,
-          silent: bool=False, logger: object=None) -> object:
-    """Watch a file path for changes run callback if modified. A WatchDog."""
+          backoff: int=1, timeout: int=None, repetitions: int=None,
+          silent: bool=False, logger: object=None,
+          backend: str="auto") -> object:
+    """Watch a file path for changes run callback if modified. A WatchDog.
+
+    backend is 'inotify' to block on Linux inotify until a change,
+    'poll' to check every interval seconds, 'auto' uses inotify if possible.
+    Raises TimeoutError if timeout seconds pass without changes.
+    repetitions is deprecated and ignored, it returns on the first change."""
+    if repetitions is not None:
+        warnings.warn("watch() repetitions is deprecated and ignored, "
+                      "it returns on the first change.",
+                      DeprecationWarning, stacklevel=2)
+    backend = _get_backend(backend)
     if not silent:
         msg = f"Watching for any changes on the file path: { file_path }."
         logger.debug(msg) if logger else print(msg)
-    previous, file_path = int(os.stat(file_path).st_mtime), str(file_path)
-    _interval, msg = interval, f"Modification detected on path: { file_path }."
-    end_time = time.time() + int(timeout) if timeout else None
-    repetitions = int(repetitions) if repetitions > 0 else True
-    while repetitions:
-        if end_time and time.time() > end_time:
-            raise  # Timeout!.
-        actual = int(os.stat(file_path).st_mtime)
-        if previous == actual:
-            time.sleep(int(abs(interval)))
-            interval *= backoff if backoff and backoff in range(1, 9) else 1
-        else:
-            previous, interval = actual, _interval
-            if not silent:
-                logger.debug(msg) if logger else print(msg)
-            return callback(file_path) if callback else file_path
+    os.stat(file_path)  # File path must exist.
+    previous, file_path = _signature(file_path), str(file_path)
+    msg = f"Modification detected on path: { file_path }."
+    end_time = time.monotonic() + float(timeout) if timeout else None
+    if backend == "inotify":
+        _watch_inotify(file_path, previous, end_time)
+    else:
+        _watch_poll(file_path, previous, interval, backoff, end_time)
+    if not silent:
+        logger.debug(msg) if logger else print(msg)
+    return callback(file_path) if callback else file_path
+
+
+class _AsyncInotify(object):
+
+    """1 inotify per asyncio event loop, shared by all its async watches.
+
+    The loop wakes by loop.add_reader only when there are events, events of
+    each watched folder are put on the asyncio.Queue of its subscribers."""
+    __slots__ = ("loop", "inotify", "queues", "folders")
+    _instances = WeakKeyDictionary()
+
+    def __init__(self, loop):
+        self.loop, self.inotify = loop, _Inotify()
+        self.queues, self.folders = {}, {}  # wd: set of queues, wd: folder.
+        loop.add_reader(self.inotify.fd, self._read)
+
+    @classmethod
+    def get(cls, loop) -> "_AsyncInotify":
+        """Get the shared _AsyncInotify of loop, create it if needed."""
+        if loop not in cls._instances:
+            cls._instances[loop] = cls(loop)
+        return cls._instances[loop]
+
+    def subscribe(self, folder: str, queue: asyncio.Queue) -> int:
+        """Put events of folder on queue, return its watch descriptor."""
+        wd = self.inotify.add_watch(folder)
+        self.folders[wd] = folder
+        self.queues.setdefault(wd, set()).add(queue)
+        return wd
+
+    def unsubscribe(self, wd: int, queue: asyncio.Queue) -> None:
+        """Stop putting events of a watch descriptor on queue."""
+        queues = self.queues.get(wd, set())
+        queues.discard(queue)
+        if not queues and wd in self.queues:
+            del self.queues[wd], self.folders[wd]
+            self.inotify.rm_watch(wd)
+
+    def release(self) -> None:
+        """Close if there are no subscribers left."""
+        if not self.queues:
+            self.loop.remove_reader(self.inotify.fd)
+            self.inotify.close()
+            self._instances.pop(self.loop, None)
+
+    def _read(self) -> None:
+        for wd, mask, name in self.inotify.read():
+            if mask & _IN_Q_OVERFLOW:  # Events lost, tell everybody.
+                queues = set().union(*self.queues.values())
+            else:
+                queues = self.queues.get(wd, ())
+            for queue in queues:
+                queue.put_nowait((self.folders.get(wd), mask, name))
+
+
+@contextmanager
+def _subscribe(folders: set, queue: asyncio.Queue):
+    """Put inotify events of all folders on queue, while on the context."""
+    inotify, wds = _AsyncInotify.get(asyncio.get_running_loop()), []
+    try:
+        for folder in folders:
+            wds.append(inotify.subscribe(folder, queue))
+        yield queue
+    finally:
+        for wd in wds:
+            inotify.unsubscribe(wd, queue)
+        inotify.release()
+
+
+async def _awatch_inotify(file_path: str, previous: tuple) -> None:
+    """Wait on the shared inotify until file path changes."""
+    folder, name = _split_watched(file_path)
+    with _subscribe({folder}, asyncio.Queue()) as queue:
+        while True:
+            actual = _signature(file_path)  # Changed before the subscribe?.
+            if actual is not None and actual != previous:
+                return
+            while True:
+                _, mask, event_name = await queue.get()
+                if name in (None, event_name) or mask & _IN_Q_OVERFLOW:
+                    break
+
+
+async def _awatch_poll(file_path: str, previous: tuple,
+                       interval: float=1) -> None:
+    """Poll file path until its modification time or size changes."""
+    while True:
+        actual = _signature(file_path)
+        if actual is not None and actual != previous:
+            return
+        await asyncio.sleep(interval)
+
+
+async def awatch(file_path: str, callback=None, interval: float=1,
+                 timeout: float=None, backend: str="auto") -> object:
+    """Watch a file path for changes run callback if modified, for asyncio.
+
+    Like watch() but never blocks the event loop, on Linux all the awatch of
+    a loop share 1 inotify woken by loop.add_reader, idle costs nothing.
+    callback can be a function or a coroutine function.
+    Raises TimeoutError if timeout seconds pass without changes."""
+    backend = _get_backend(backend)
+    os.stat(file_path)  # File path must exist.
+    previous, file_path = _signature(file_path), str(file_path)
+    waiter = (_awatch_inotify(file_path, previous) if backend == "inotify"
+              else _awatch_poll(file_path, previous, interval))
+    try:
+        await asyncio.wait_for(waiter, timeout)
+    except asyncio.TimeoutError:
+        raise TimeoutError("Timeout while watching for changes.")
+    result = callback(file_path) if callback else file_path
+    return await result if inspect.isawaitable(result) else result
+
+
+async def awatch_changes(paths: tuple, interval: float=1,
+                         debounce: float=0.1, backend: str="auto"):
+    """Watch many files and folders, async iterator of the changed paths.
+
+    Files change when its modification time or size changes, folders when
+    any of its files is added, removed or modified. A burst of changes is
+    yielded once, debounce seconds after the first change of the burst."""
+    backend = _get_backend(backend)
+    paths = [os.path.abspath(_) for _ in (
+        (paths, ) if isinstance(paths, (str, os.PathLike)) else paths)]
+    folders = {_ for _ in paths if os.path.isdir(_)}
+    signatures = {_: (_signature_folder(_) if _ in folders and
+                      backend == "poll" else _signature(_)) for _ in paths}
+    if backend == "poll":
+        while True:
+            await asyncio.sleep(interval)
+            for path in paths:
+                actual = (_signature_folder(path) if path in folders
+                          else _signature(path))
+                if actual != signatures[path]:
+                    signatures[path] = actual
+                    if actual is not None:
+                        yield path
+    watched = {_ if _ in folders else os.path.dirname(_) for _ in paths}
+    with _subscribe(watched, asyncio.Queue()) as queue:
+        while True:
+            events = [await queue.get()]
+            await asyncio.sleep(debounce)  # Coalesce the burst of events.
+            while not queue.empty():
+                events.append(queue.get_nowait())
+            changed = set()
+            for folder, mask, name in events:
+                if mask & _IN_Q_OVERFLOW:
+                    changed.update(paths)
+                    continue
+                changed.add(folder)
+                changed.add(os.path.join(folder, name) if name else folder)
+            for path in paths:
+                if path not in changed:
+                    continue
+                if path not in folders:
+                    actual = _signature(path)  # Not all events are changes.
+                    if actual is None or actual == signatures[path]:
+                        continue
+                    signatures[path] = actual
+                yield path
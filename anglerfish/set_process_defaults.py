@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Set process global defaults, no Bytecode cache and default SIGINT."""
+
+
+import logging as log
+import signal
+import sys
+
+
+def set_process_defaults(bytecode: bool=False, sigint: bool=True) -> bool:
+    """Set process global defaults, no Bytecode cache and default SIGINT."""
+    sys.dont_write_bytecode = not bytecode
+    try:
+        if sigint:  # CTRL+C kills the process right away,no KeyboardInterrupt
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+    except Exception as error:
+        log.warning(error)
+        return False  # Signals can only be set from the Main Thread.
+    else:
+        log.debug(f"Process defaults set: bytecode={bytecode}, "
+                  f"sigint={sigint}.")
+        return True
@@ -10,69 +10,235 @@ from collections import OrderedDict, namedtuple
 from pathlib import Path
 from types import MappingProxyType as frozendict
 
+from anglerfish.walk2list import _scan, _scandir
+
 
 try:
-    from ujson import dumps
+    from ujson import dumps, loads
 except ImportError:
-    from json import dumps
+    from json import dumps, loads
+
+
+_STAT_DIR_FD = os.stat in os.supports_dir_fd  # Not on Windows.
+
+
+class FileStat(namedtuple("FileStat", "name mode ino dev nlink uid gid "
+                                      "size atime mtime ctime "
+                                      "mtime_ns ctime_ns")):
+
+    """Compact record of 1 file, a tuple, also indexable by field name.
+
+    A tuple per file is much smaller than a dict with the same keys,
+    record['size'] and record.size both work, like the old dict records.
+    mtime_ns and ctime_ns find changes within the same second."""
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+
+def _stat_entries(files: list, showhidden: bool=False) -> list:
+    """Stat all the DirEntry files, return a list of FileStat records."""
+    records, new = [], tuple.__new__  # tuple.__new__ faster than FileStat()
+    for fyle in files:
+        if not showhidden and fyle.name.startswith("."):
+            continue
+        try:  # File deleted meanwhile, or no permission, skip it.
+            stat = fyle.stat()
+        except OSError:
+            continue
+        records.append(new(FileStat, (
+            fyle.name, *stat[:10], stat.st_mtime_ns, stat.st_ctime_ns)))
+    return records
+
+
+def _folder2dict(folder: Path, path: str, dirs: list, files: list,
+                 showhidden: bool=False, strip: bool=False) -> dict:
+    """Gather the dict of 1 folder, with the stat of all its DirEntry files."""
+    dirs = [_.name for _ in dirs if showhidden or not _.name.startswith(".")]
+    a = {}
+    if strip:
+        p = path.strip(str(folder) + os.sep)
+    else:
+        p = path
+    if len(p.split(os.sep)) == 1:
+        parent = ''
+    if len(p.split(os.sep)) > 1:
+        parent = os.sep.join(p.split(os.sep)[:-1])
+    if path == str(folder):
+        parent = 'root'
+    a['path'] = p
+    a['fullpath'] = os.path.abspath(path)
+    a['parent'] = parent
+    a['dirs'] = dirs
+    a['files'] = _stat_entries(files, showhidden)
+    return a
+
+
+def _dict2json(dict_f: dict) -> str:
+    """JSON dumps string of the dict, with the file records as objects."""
+    return dumps(dict(dict_f, files=[_._asdict() for _ in dict_f['files']]))
 
 
 def walk2dict(folder: Path, topdown: bool=True,
               onerror: object=None, followlinks: bool=False,
-              showhidden: bool=False, strip: bool=False) -> namedtuple:
+              showhidden: bool=False, strip: bool=False,
+              max_workers: int=0) -> namedtuple:
     """Perform full walk, gather full path of all files,
-    based on os.walk with multiple output types & extras.
+    based on os.scandir with multiple output types & extras.
 
     Returns a namedtuple 'walk2dict' with multiple output types:
     - Nested common dictionary represents folder/file structure of folder.
     - JSON dumps string of the dictionary, uses uJSON if installed.
     - collections.OrderedDict() of the dictionary.
-    - types.MappingProxyType() inmmutable of the dictionary."""
-    ret = []
-    for path, dirs, files in os.walk(folder, topdown=topdown,
-                                     onerror=onerror, followlinks=followlinks):
-        if not showhidden:
-            dirs = [_ for _ in dirs if not _.startswith(".")]
-            files = [_ for _ in files if not _.startswith(".")]
-        a = {}
-        if strip:
-            p = path.strip(str(folder) + os.sep)
-        else:
-            p = path
-        if len(p.split(os.sep)) == 1:
-            parent = ''
-        if len(p.split(os.sep)) > 1:
-            parent = os.sep.join(p.split(os.sep)[:-1])
-        if path == str(folder):
-            parent = 'root'
-        a['path'] = p
-        a['fullpath'] = os.path.abspath(path)
-        a['parent'] = parent
-        a['dirs'] = dirs
-        a['files'] = []
-
-        for fyle in files:
-            try:  # sometimes os.stat(ff) just fails,breaking all the loop.
-                f = {}
-                ff = path + os.sep + fyle
-                (mode, ino, dev, nlink, uid, gid, size,
-                 atime, mtime, ctime) = os.stat(ff)
-                f['name'] = fyle
-                f['mode'] = mode
-                f['ino'] = ino
-                f['dev'] = dev
-                f['nlink'] = nlink
-                f['uid'] = uid
-                f['gid'] = gid
-                f['size'] = size
-                f['atime'] = atime
-                f['mtime'] = mtime
-                f['ctime'] = ctime
-                a['files'].append(f)
-            except Exception:
-                pass
-        ret.append(a)
+    - types.MappingProxyType() inmmutable of the dictionary.
+    Files are FileStat compact records, indexable by field name like a dict.
+    If max_workers, folders are scanned in parallel by max_workers Threads,
+    for network filesystems, topdown is ignored."""
+    ret = [_folder2dict(folder, path, dirs, files, showhidden, strip)
+           for path, dirs, files in _scandir(
+               folder, max_workers, onerror, followlinks, topdown)]
     dict_f = ret[0]
 
     return namedtuple("walk2dict", "dict json OrderedDict frozendict")(
-        dict_f, dumps(dict_f), OrderedDict(dict_f), frozendict(dict_f))
+        dict_f, _dict2json(dict_f), OrderedDict(dict_f), frozendict(dict_f))
+
+
+class Walk2DictSnapshot(object):
+
+    """Snapshot of all the folders and files of a folder, for walk2dict_delta.
+
+    folders maps each folder path to its mtime_ns, its subfolder names
+    and its FileStat file records, save() and load() persist it as JSON."""
+    __slots__ = ("folder", "showhidden", "followlinks", "folders")
+
+    def __init__(self, folder: str, showhidden: bool=False,
+                 followlinks: bool=False, folders: dict=None):
+        self.folder, self.showhidden = os.path.abspath(folder), showhidden
+        self.followlinks, self.folders = followlinks, folders or {}
+
+    def __len__(self) -> int:
+        return sum(len(_[2]) for _ in self.folders.values())
+
+    def __repr__(self) -> str:
+        return (f"Walk2DictSnapshot(folder={self.folder!r}, "
+                f"folders={len(self.folders)}, files={len(self)})")
+
+    def save(self, filename: str) -> str:
+        """Save the snapshot to a JSON file, return the filename."""
+        with open(filename, "w", encoding="utf-8") as fyle:
+            fyle.write(dumps({
+                "folder": self.folder, "showhidden": self.showhidden,
+                "followlinks": self.followlinks, "folders": self.folders}))
+        return filename
+
+    @classmethod
+    def load(cls, filename: str) -> "Walk2DictSnapshot":
+        """Load a snapshot from a JSON file saved by save()."""
+        with open(filename, encoding="utf-8") as fyle:
+            data, new = loads(fyle.read()), tuple.__new__
+        return cls(data["folder"], data["showhidden"], data["followlinks"], {
+            path: (mtime_ns, tuple(dirs), tuple(new(FileStat, _) for _ in fs))
+            for path, (mtime_ns, dirs, fs) in data["folders"].items()})
+
+
+def _stat_files(path: str, files: tuple) -> tuple:
+    """Stat again the files of an unchanged folder, skip the deleted ones.
+
+    Stats relative to the folder file descriptor if the OS supports it,
+    unchanged records are reused, not duplicated on RAM."""
+    records, new = [], tuple.__new__
+    dir_fd = os.open(path, os.O_RDONLY) if _STAT_DIR_FD else None
+    try:
+        for record in files:
+            try:
+                stat = os.stat(record.name if dir_fd is not None else
+                               os.path.join(path, record.name), dir_fd=dir_fd)
+            except OSError:
+                continue
+            stat = (record.name, *stat[:10], stat.st_mtime_ns,
+                    stat.st_ctime_ns)
+            records.append(record if stat == record else new(FileStat, stat))
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+    return tuple(records)
+
+
+def _list_folder(path: str, showhidden: bool, followlinks: bool) -> tuple:
+    """List a changed folder, return its subfolder names and file records."""
+    _, folders, files = _scan(path)
+    hidden = () if showhidden else "."
+    dirs = tuple(_.name for _ in folders if not _.name.startswith(hidden) and
+                 (followlinks or not _.is_symlink()))
+    return dirs, tuple(_stat_entries(files, showhidden))
+
+
+def _walk_delta(previous_snapshot: Walk2DictSnapshot, quick: bool=False,
+                changes: tuple=None) -> Walk2DictSnapshot:
+    """Walk again the folder of a snapshot, fill the changes if not None."""
+    previous = previous_snapshot.folders
+    snapshot = Walk2DictSnapshot(
+        previous_snapshot.folder, previous_snapshot.showhidden,
+        previous_snapshot.followlinks)
+    pending = [snapshot.folder]
+    while pending:
+        path = pending.pop()
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            old = previous.get(path)
+            if old and old[0] == mtime_ns:  # Folder listing is unchanged.
+                dirs = old[1]
+                files = old[2] if quick else _stat_files(path, old[2])
+            else:
+                dirs, files = _list_folder(
+                    path, snapshot.showhidden, snapshot.followlinks)
+        except OSError:
+            continue  # Folder deleted meanwhile, or no permission.
+        snapshot.folders[path] = (mtime_ns, dirs, files)
+        pending.extend(os.path.join(path, _) for _ in reversed(dirs))
+        if changes is None or old and files is old[2]:
+            continue  # Not comparing, or quick and nothing to compare.
+        added, removed, modified = changes
+        old_files = {_.name: _ for _ in old[2]} if old else {}
+        for record in files:
+            before = old_files.pop(record.name, None)
+            if before is record:
+                continue  # Unchanged, reused by _stat_files.
+            elif before is None:
+                added[os.path.join(path, record.name)] = record
+            elif before[:8] + before[9:] != record[:8] + record[9:]:  # atime
+                modified[os.path.join(path, record.name)] = record
+        for record in old_files.values():
+            removed[os.path.join(path, record.name)] = record
+    if changes is not None:
+        for path in previous.keys() - snapshot.folders.keys():  # Deleted.
+            for record in previous[path][2]:
+                changes[1][os.path.join(path, record.name)] = record
+    return snapshot
+
+
+def walk2dict_snapshot(folder: str, showhidden: bool=False,
+                       followlinks: bool=False) -> Walk2DictSnapshot:
+    """Take a full Walk2DictSnapshot of all the folders and files of folder.
+
+    Hidden folders are not walked if not showhidden, like .git folders."""
+    return _walk_delta(Walk2DictSnapshot(folder, showhidden, followlinks))
+
+
+def walk2dict_delta(previous_snapshot: Walk2DictSnapshot,
+                    quick: bool=False) -> namedtuple:
+    """Walk again the folder of a snapshot, get only the changed files.
+
+    Folders with the same mtime as on the snapshot are not listed again,
+    its files are only stat again to find modified ones, if quick is True
+    not even that, only files added, deleted or renamed are found,
+    at a cost of 1 stat per folder, a file modified in place is not found.
+    Returns a namedtuple 'walk2dict_delta' with dicts of file path to
+    FileStat of added, removed and modified files, and the new snapshot."""
+    changes = ({}, {}, {})
+    snapshot = _walk_delta(previous_snapshot, quick, changes)
+    return namedtuple("walk2dict_delta", "added removed modified snapshot")(
+        *changes, snapshot)
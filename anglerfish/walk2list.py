@@ -6,7 +6,12 @@
 
 
 import os
-from collections import deque, namedtuple
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import translate
+from functools import lru_cache
+from queue import SimpleQueue
 
 
 try:
@@ -15,27 +20,217 @@ except ImportError:
     from json import dumps
 
 
-def walk2list(folder: str, target: tuple, omit: tuple=(),
+_PATTERN = type(re.compile(""))
+_INLINE_FLAGS = (("i", re.IGNORECASE), ("m", re.MULTILINE),
+                 ("s", re.DOTALL), ("x", re.VERBOSE))
+
+
+class _Walk2List(object):
+
+    """namedtuple-like 'walk2list', outputs computed only when accessed.
+
+    Each output type is built from the list on first access and cached,
+    outputs never accessed never use any memory."""
+    _fields = ("list", "tuple", "json", "set", "frozenset", "deque")
+    _builders = {"tuple": tuple, "json": dumps, "set": set,
+                 "frozenset": frozenset, "deque": deque}
+
+    def __init__(self, lst: list):
+        self.list = lst
+
+    def __getattr__(self, name: str):
+        if name not in self._builders:
+            raise AttributeError(f"'walk2list' object has no attribute {name}")
+        value = self._builders[name](self.list)
+        setattr(self, name, value)  # Cached, next access is a plain attribute.
+        return value
+
+    def __getitem__(self, index):
+        return getattr(self, self._fields[index])
+
+    def __iter__(self):
+        return (getattr(self, _) for _ in self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __repr__(self):
+        return f"walk2list(list={self.list!r}, ...)"
+
+    def _asdict(self) -> dict:
+        return {_: getattr(self, _) for _ in self._fields}
+
+
+def _pattern2regex(pattern) -> str:
+    """Glob string or compiled regex to a regex string, flags inlined."""
+    if isinstance(pattern, str):
+        return r"\A" + translate(pattern)  # Glob matches the whole name.
+    flags = "".join(_ for _, flag in _INLINE_FLAGS if pattern.flags & flag)
+    return f"(?{flags}:{pattern.pattern})" if flags else pattern.pattern
+
+
+@lru_cache(maxsize=64)
+def _compile_patterns(patterns: tuple) -> object:
+    """Compile glob and regex patterns into 1 combined regex search."""
+    return re.compile("|".join(
+        f"(?:{_pattern2regex(_)})" for _ in patterns)).search
+
+
+def _get_matcher(patterns) -> object:
+    """Get a function that matches a name with any pattern, None if empty."""
+    if isinstance(patterns, (str, _PATTERN)):
+        patterns = (patterns, )
+    return _compile_patterns(tuple(patterns)) if patterns else None
+
+
+def _walkable(entry: os.DirEntry, followlinks: bool=False,
+              prune: object=None) -> bool:
+    """Check if a subfolder DirEntry should be walked, or is pruned."""
+    return ((followlinks or not entry.is_symlink()) and
+            (prune is None or not prune(entry.name)))
+
+
+def _scan(path: str) -> tuple:
+    """Scan 1 folder, return its path, folders and files as DirEntry lists."""
+    folders, files = [], []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            (folders if is_dir else files).append(entry)
+    return path, folders, files
+
+
+def _scandir_serial(folder: str, onerror: object=None,
+                    followlinks: bool=False, topdown: bool=True,
+                    prune: object=None):
+    """Yield path, folders and files of all folders, on os.walk order."""
+    if not topdown:
+        yield from _scandir_bottomup(
+            os.fspath(folder), onerror, followlinks, prune)
+        return
+    pending = [os.fspath(folder)]
+    while pending:
+        try:
+            path, folders, files = _scan(pending.pop())
+        except OSError as error:
+            if onerror is not None:
+                onerror(error)
+            continue
+        yield path, folders, files
+        pending.extend(reversed([  # First folder is walked first.
+            _.path for _ in folders if _walkable(_, followlinks, prune)]))
+
+
+def _scandir_bottomup(path: str, onerror: object=None,
+                      followlinks: bool=False, prune: object=None):
+    """Yield path, folders and files of all folders, subfolders first."""
+    try:
+        scanned = _scan(path)
+    except OSError as error:
+        if onerror is not None:
+            onerror(error)
+        return
+    for entry in scanned[1]:
+        if _walkable(entry, followlinks, prune):
+            yield from _scandir_bottomup(
+                entry.path, onerror, followlinks, prune)
+    yield scanned
+
+
+def _scandir_parallel(folder: str, max_workers: int, onerror: object=None,
+                      followlinks: bool=False, prune: object=None):
+    """Yield path, folders and files of all folders, on any order.
+
+    Folders are scanned in parallel on a Thread Pool, the results come back
+    on a work Queue and its subfolders are submitted as new work,
+    for latency-bound filesystems like NFS, many listings are in flight."""
+    results = SimpleQueue()
+
+    def scan(path):
+        try:
+            results.put((_scan(path), None))
+        except BaseException as error:
+            results.put((None, error))
+
+    with ThreadPoolExecutor(max_workers=max_workers,
+                            thread_name_prefix="angler") as pool:
+        pool.submit(scan, os.fspath(folder))  # Root is always yielded first.
+        pending = 1
+        while pending:
+            scanned, error = results.get()
+            pending -= 1
+            if error is not None:
+                if not isinstance(error, OSError):
+                    raise error
+                if onerror is not None:
+                    onerror(error)
+                continue
+            for entry in scanned[1]:
+                if _walkable(entry, followlinks, prune):
+                    pool.submit(scan, entry.path)
+                    pending += 1
+            yield scanned
+
+
+def _scandir(folder: str, max_workers: int=0, onerror: object=None,
+             followlinks: bool=False, topdown: bool=True,
+             prune: object=None):
+    """Yield path, folders and files of all folders, parallel on Threads.
+
+    Subfolders with a name that prune(name) is True are not walked."""
+    if max_workers:
+        return _scandir_parallel(
+            folder, max_workers, onerror, followlinks, prune)
+    return _scandir_serial(folder, onerror, followlinks, topdown, prune)
+
+
+def iwalk2list(folder: str, target: tuple="", omit: tuple=(),
+               showhidden: bool=False, onerror: object=None,
+               followlinks: bool=False, max_workers: int=0,
+               topdown: bool=True, include: tuple=(), exclude: tuple=()):
+    """Perform full walk, yield full path of all files as they are found,
+    based on os.scandir, on the same order as os.walk, low RAM.
+
+    If max_workers, folders are scanned in parallel by max_workers Threads,
+    yielding on the order they are found, for network filesystems.
+    include and exclude are glob strings or compiled regex searched on the
+    names, combined into 1 regex, excluded folders are never walked."""
+    hidden, folder = () if showhidden else ".", os.path.abspath(folder)
+    included, excluded = _get_matcher(include), _get_matcher(exclude)
+    for _, _, files in _scandir(
+            folder, max_workers, onerror, followlinks, topdown, excluded):
+        for entry in files:
+            name = entry.name
+            if (not name.startswith(hidden) and not name.endswith(omit) and
+                    name.endswith(target) and
+                    (included is None or included(name)) and
+                    (excluded is None or not excluded(name))):
+                yield entry.path
+
+
+def walk2list(folder: str, target: tuple="", omit: tuple=(),
               showhidden: bool=False, topdown: bool=True,
-              onerror: object=None, followlinks: bool=False) -> namedtuple:
+              onerror: object=None, followlinks: bool=False,
+              max_workers: int=0, include: tuple=(),
+              exclude: tuple=()) -> _Walk2List:
     """Perform full walk, gather full path of all files,
-    based on os.walk with multiple output types & extras.
+    based on os.scandir with multiple output types & extras.
 
-    Returns a namedtuple 'walk2list' with multiple output types:
+    Returns a namedtuple-like 'walk2list' with multiple output types,
+    each one computed only when accessed:
     - List represents folder/file structure of folder.
     - JSON dumps string of the list, uses uJSON if installed.
     - tuple of the list.
     - set of the list.
     - frozenset of the list.
-    - collections.deque of the list."""
-    oswalk = os.walk(folder, topdown=topdown,
-                     onerror=onerror, followlinks=followlinks)
-
-    lst = [os.path.abspath(os.path.join(r, f))
-           for r, d, fs in oswalk
-           for f in fs if not f.startswith(() if showhidden else ".") and
-           not f.endswith(omit) and
-           f.endswith(target)]
-
-    return namedtuple("walk2list", "list tuple json set frozenset deque")(
-        lst, tuple(lst), dumps(lst), set(lst), frozenset(lst), deque(lst))
+    - collections.deque of the list.
+    If max_workers, folders are scanned in parallel by max_workers Threads,
+    the list is on the order the files are found, topdown is ignored.
+    include and exclude are glob strings or compiled regex searched on the
+    names, combined into 1 regex, excluded folders are never walked."""
+    return _Walk2List(list(iwalk2list(folder, target, omit, showhidden,
+                                      onerror, followlinks, max_workers,
+                                      topdown, include, exclude)))
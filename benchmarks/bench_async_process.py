@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Benchmark Sync2Async.run_async_on_process scaling of CPU-bound work.
+
+Runs the same CPU-bound tasks with run_async_on_thread, where the GIL keeps
+them on 1 CPU, and with run_async_on_process on 1, 2, 4 ... CPUs Processes.
+The previous run_async_on_process used the default Thread executor,
+so it never scaled past 1 CPU, same as run_async_on_thread here.
+Speedup is bounded by the number of CPUs of the machine running it.
+"""
+
+
+import asyncio
+import os
+import time
+
+from anglerfish import Sync2Async
+
+
+TASKS, N = 16, 2_000_000
+
+
+def cpu_bound(n: int) -> int:
+    """Pure Python CPU-bound work, holds the GIL all the time."""
+    return sum(_ * _ for _ in range(n))
+
+
+async def bench(run_async) -> float:
+    """Return seconds to run all the tasks concurrently."""
+    start = time.perf_counter()
+    await asyncio.gather(*[run_async(cpu_bound, N) for _ in range(TASKS)])
+    return time.perf_counter() - start
+
+
+def workers() -> list:
+    """Get 1, 2, 4 ... up to the number of CPUs, always including it."""
+    cpus, sizes = os.cpu_count() or 1, [1]
+    while sizes[-1] * 2 < cpus:
+        sizes.append(sizes[-1] * 2)
+    return sizes + [cpus] if cpus > 1 else sizes
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    print(f"CPUs: {os.cpu_count()}, {TASKS} tasks of sum of {N} squares.\n")
+    baseline = asyncio.run(bench(Sync2Async.run_async_on_thread))
+    print(f"{'Threads, GIL bound':<28}{baseline:8.2f} s   1.00x")
+    for processes in workers():
+        Sync2Async.set_max_workers(processes=processes)
+        asyncio.run(bench(Sync2Async.run_async_on_process))  # Warm up Pool.
+        seconds = asyncio.run(bench(Sync2Async.run_async_on_process))
+        print(f"{f'{processes} Processes':<28}{seconds:8.2f} s "
+              f"{baseline / seconds:6.2f}x")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Benchmark Sync2Async.run_async_on_thread latency and throughput.
+
+Compares the previous implementation, a new Thread per call polling the
+Future every 100ms, against a reused Thread Pool completing an asyncio
+Future with loop.call_soon_threadsafe. 10k small calls, instant ones and
+1ms of blocking I/O, concurrent, and sequential for the latency of each call.
+The previous implementation is unbounded, 10k calls are 10k Threads.
+"""
+
+
+import asyncio
+import functools
+import threading
+import time
+
+from anglerfish.make_async import _AsyncThreadingCall
+
+
+CALLS, SEQUENTIAL = 10_000, 20
+
+
+async def previous_run_async_on_thread(sync_code, *args, **kwargs):
+    """The previous implementation, 1 new Thread and polls every 100ms."""
+    sync_function = functools.partial(sync_code, *args, **kwargs)
+    future = asyncio.get_running_loop().create_future()
+
+    def run_future():
+        try:
+            future.set_result(sync_function())  # Not thread safe either.
+        except Exception as error:
+            future.set_exception(error)
+    threading.Thread(target=run_future, name="angler").start()
+    while not future.done():
+        await asyncio.sleep(.1)
+    return future.result()
+
+
+async def current_run_async_on_thread(sync_code, *args, **kwargs):
+    return await _AsyncThreadingCall(None, sync_code)(*args, **kwargs)
+
+
+async def bench(run_async_on_thread, function, *args) -> tuple:
+    """Return calls per second concurrent, and seconds per call sequential."""
+    start = time.perf_counter()
+    await asyncio.gather(*[run_async_on_thread(function, *args)
+                           for _ in range(CALLS)])
+    throughput = CALLS / (time.perf_counter() - start)
+    start = time.perf_counter()
+    for _ in range(SEQUENTIAL):
+        await run_async_on_thread(function, *args)
+    return throughput, (time.perf_counter() - start) / SEQUENTIAL
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    for workload, args in (("instant", (abs, -1)),
+                           ("1ms I/O", (time.sleep, 0.001))):
+        print(f"\n{workload}:")
+        for name, run_async_on_thread in (
+                ("previous, Thread per call", previous_run_async_on_thread),
+                ("current, Thread Pool", current_run_async_on_thread)):
+            throughput, latency = asyncio.run(
+                bench(run_async_on_thread, *args))
+            print(f"{name:<28}{throughput:10.0f} calls/s "
+                  f"{latency * 1000:10.3f} ms/call sequential")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Benchmark get_autochecksum throughput on GB/s, and its peak RAM usage.
+
+Compares reading the whole file into RAM (the previous implementation)
+against reading on reused chunks, and serial against parallel batches.
+"""
+
+
+import os
+import resource
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from zlib import adler32
+
+from anglerfish.make_autochecksum import get_autochecksum, get_autochecksums
+
+
+FILES, FILE_SIZE = 8, 128 * 1024 * 1024
+
+
+def get_autochecksum_read_bytes(filepath: str) -> str:
+    """The previous implementation, reads the whole file into RAM."""
+    return ".✔" + hex(adler32(Path(filepath).read_bytes()) & 0xffffffff)[2:]
+
+
+def bench(function, *args) -> float:
+    """Run function with args, return seconds elapsed."""
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def max_rss() -> int:
+    """Peak RAM used by this process, on Megabytes."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    gigabytes = FILES * FILE_SIZE / 1024 ** 3
+    with TemporaryDirectory() as folder:
+        filepaths = [os.path.join(folder, f"{_}.bin") for _ in range(FILES)]
+        for filepath in filepaths:
+            with open(filepath, "wb") as fyle:  # Write on chunks, low RAM.
+                for _ in range(FILE_SIZE // 1024 ** 2):
+                    fyle.write(os.urandom(1024 ** 2))
+        print(f"{FILES} files of {FILE_SIZE // 1024 ** 2} Megabytes each.")
+        for name, function, args in (
+                ("chunked, serial", lambda: [
+                    get_autochecksum(_) for _ in filepaths], ()),
+                ("chunked, parallel batch", get_autochecksums, (filepaths, )),
+                ("read_bytes, serial", lambda: [
+                    get_autochecksum_read_bytes(_) for _ in filepaths], ())):
+            elapsed = bench(function, *args)
+            print(f"{name:<30} {gigabytes / elapsed:6.2f} GB/s, "
+                  f"peak RAM so far {max_rss()} Megabytes")
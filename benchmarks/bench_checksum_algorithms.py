@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Benchmark autochecksum algorithms by file size, on GB/s.
+
+Each cell hashes TOTAL bytes worth of files of that size, from page cache.
+"""
+
+
+import os
+import time
+from tempfile import TemporaryDirectory
+
+from anglerfish.make_autochecksum import ALGORITHMS, get_autochecksum
+
+
+SIZES, TOTAL = (4 * 1024, 1024 ** 2, 64 * 1024 ** 2), 256 * 1024 ** 2
+
+
+def bench(filepath: str, repeat: int, algorithm: str) -> float:
+    """Checksum filepath repeat times with algorithm, return GB/s."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        get_autochecksum(filepath, algorithm=algorithm)
+    elapsed = time.perf_counter() - start
+    return os.path.getsize(filepath) * repeat / elapsed / 1024 ** 3
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    print(f"{'algorithm':<12}" + "".join(
+        f"{f'{size // 1024} Kb':>14}" for size in SIZES))
+    with TemporaryDirectory() as folder:
+        filepaths = []
+        for size in SIZES:
+            filepaths.append(os.path.join(folder, f"{size}.bin"))
+            with open(filepaths[-1], "wb") as fyle:
+                fyle.write(os.urandom(size))
+        for algorithm in ALGORITHMS:
+            print(f"{algorithm:<12}" + "".join(
+                f"{bench(filepath, TOTAL // size, algorithm):9.2f} GB/s"
+                for filepath, size in zip(filepaths, SIZES)))
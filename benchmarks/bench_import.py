@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Benchmark import time of anglerfish, lazy versus eager, on fresh processes.
+
+The eager case imports the package and then resolves every name on __all__,
+that is the same work the package did at import time before lazy imports.
+"""
+
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+REPEAT = 20
+CASES = {
+    "python -c pass (baseline)": "pass",
+    "import anglerfish (lazy)": "import anglerfish",
+    "from anglerfish import bytes2human": "from anglerfish import bytes2human",
+    "import anglerfish (eager, all names)": (
+        "import anglerfish\nfor _ in anglerfish.__all__: "
+        "getattr(anglerfish, _)"),
+}
+
+
+def bench(code: str, repeat: int=REPEAT) -> float:
+    """Run code on a fresh interpreter repeat times, return best in ms."""
+    cwd, best = Path(__file__).parent.parent, float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.check_call((sys.executable, "-c", code), cwd=str(cwd),
+                              stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best * 1_000
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    for name, code in CASES.items():
+        print(f"{name:<40} {bench(code):8.2f} ms (best of {REPEAT})")
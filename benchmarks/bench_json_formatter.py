@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Benchmark formatting cost per log record, plain text versus JSON.
+
+Compares the plain text logging.Formatter with _LOG_FORMAT,
+the JSONFormatter with pre-built key template, uses uJSON if installed,
+and a naive JSON Formatter that does json.dumps() of a dict per record.
+"""
+
+
+import json
+import logging
+import time
+
+from anglerfish.make_logger import (_LOG_DATEFMT, _LOG_FORMAT, JSONFormatter,
+                                    json_string)
+
+
+RECORDS = 200_000
+
+
+class NaiveJSONFormatter(logging.Formatter):
+
+    """JSON Formatter that builds a dict and dumps it on each record."""
+
+    def format(self, record):
+        record.message = record.getMessage()
+        record.asctime = self.formatTime(record, self.datefmt)
+        return json.dumps({_: getattr(record, _)
+                           for _ in JSONFormatter.fields})
+
+
+def bench(formatter: logging.Formatter) -> float:
+    """Format RECORDS records with formatter, return microseconds each."""
+    record = logging.LogRecord(
+        "bench", logging.INFO, __file__, 42, "Benchmark record %s of %s.",
+        (1, RECORDS), None, "bench")
+    format_record = formatter.format
+    start = time.perf_counter()
+    for _ in range(RECORDS):
+        format_record(record)
+    return (time.perf_counter() - start) * 1_000_000 / RECORDS
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    print(f"JSON string escaping: {json_string.__module__}.")
+    for name, formatter in (
+            ("logging.Formatter(_LOG_FORMAT)",
+             logging.Formatter(fmt=_LOG_FORMAT, datefmt=_LOG_DATEFMT)),
+            ("JSONFormatter", JSONFormatter(datefmt=_LOG_DATEFMT)),
+            ("naive json.dumps(dict)",
+             NaiveJSONFormatter(datefmt=_LOG_DATEFMT))):
+        print(f"{name:<40} {bench(formatter):8.3f} us/record")
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Benchmark per call overhead of multiprocessed and MultiProcessExecutor.
+
+Starting new Processes on every call, like multiprocessed did with a new
+Pool and a Manager Process, against reusing them on every call,
+like multiprocessed and MultiProcessExecutor do now,
+progress is 1 shared counter updated once per chunk.
+Many calls of few small items, where the overhead dominates.
+"""
+
+
+import contextlib
+import os
+import time
+
+from anglerfish import MultiProcessExecutor, multiprocessed
+
+
+CALLS, ITEMS, CPUS = 20, 100, 2
+
+
+def bench(function) -> float:
+    """Return seconds per call."""
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        assert function(abs, range(-ITEMS, 0)) == list(range(ITEMS, 0, -1))
+    return (time.perf_counter() - start) / CALLS
+
+
+def new_executor_per_call(function, items) -> list:
+    """New Processes on every call, started and shutdown."""
+    with MultiProcessExecutor(cpu_num=CPUS) as executor:
+        return multiprocessed(function, list(items), executor=executor)
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    print(f"{CALLS} calls of {ITEMS} items on {CPUS} Processes.\n")
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):  # Its progress on stdout.
+            seconds = bench(new_executor_per_call)
+            reused = bench(lambda function, items: multiprocessed(
+                function, list(items), cpu_num=CPUS))
+    print(f"{'new Processes per call':<36}{seconds * 1000:10.2f} ms/call")
+    print(f"{'multiprocessed, reused':<36}{reused * 1000:10.2f} ms/call")
+    with MultiProcessExecutor(cpu_num=CPUS) as executor:
+        for chunksize in (1, 16):
+            seconds = bench(lambda function, items: executor.map(
+                function, items, chunksize=chunksize))
+            print(f"{f'MultiProcessExecutor chunksize={chunksize}':<36}"
+                  f"{seconds * 1000:10.2f} ms/call")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Benchmark multiprocessed scheduling with heavy-tailed job durations.
+
+Job durations follow a Pareto distribution, a few jobs take most of the time.
+The previous implementation split the jobs into cpu_num contiguous slices
+up front with _get_index, the Process that gets the slow jobs finishes last.
+The current implementation schedules small chunks dynamically, idle
+Processes take the next chunk, the slowest Process finishes much earlier.
+Jobs sleep, so it runs the same on machines with less CPUs than Processes.
+"""
+
+
+import contextlib
+import multiprocessing
+import os
+import random
+import time
+
+from anglerfish import multiprocessed
+
+
+JOBS, CPUS, SEEDS = 256, 8, (1, 2, 3)
+
+
+def job(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+def previous_get_index(job_queue: list, split_num: int) -> int:
+    """The previous implementation, static contiguous slices."""
+    job_num = len(job_queue)
+    if job_num < split_num:
+        split_num = job_num
+    each_num = job_num / split_num
+    index = [[i * each_num, i * each_num + each_num - 1]
+             for i in range(split_num)]
+    residual_num = job_num % split_num
+    for i in range(residual_num):
+        index[split_num - residual_num + i][0] += i
+        index[split_num - residual_num + i][1] += i + 1
+    return index
+
+
+def previous_slice(jobs: list) -> list:
+    return [job(_) for _ in jobs]
+
+
+def previous_multiprocessed(function, jobs: list, cpu_num: int) -> list:
+    """The previous implementation, 1 slice per Process, without progress."""
+    index = previous_get_index(jobs, cpu_num)
+    with multiprocessing.Pool(processes=cpu_num) as pool:
+        slices = pool.map(previous_slice, [
+            jobs[int(index[i][0]): int(index[i][1] + 1)]
+            for i in range(len(index))])
+    return [_ for results in slices for _ in results]
+
+
+def durations(seed: int) -> list:
+    """Heavy-tailed job durations, 2ms minimum, 2 seconds maximum."""
+    generator = random.Random(seed)
+    return [min(0.002 * generator.paretovariate(1.2), 2) for _ in range(JOBS)]
+
+
+def bench(function, jobs: list) -> float:
+    """Return seconds until the slowest Process finishes, the makespan."""
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):  # Its progress on stdout.
+            start = time.perf_counter()
+            assert function(job, jobs, cpu_num=CPUS) == jobs
+            return time.perf_counter() - start
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    print(f"{JOBS} jobs on {CPUS} Processes, CPUs: {os.cpu_count()}.\n")
+    for seed in SEEDS:
+        jobs = durations(seed)
+        ideal = max(sum(jobs) / CPUS, max(jobs))
+        print(f"seed {seed}: total {sum(jobs):.2f} s, slowest job "
+              f"{max(jobs):.2f} s, ideal makespan {ideal:.2f} s")
+        for name, function in (
+                ("previous, static slices", previous_multiprocessed),
+                ("current, dynamic chunks", multiprocessed)):
+            seconds = bench(function, jobs)
+            print(f"  {name:<28}{seconds:8.2f} s, tail over ideal "
+                  f"{seconds - ideal:6.2f} s")
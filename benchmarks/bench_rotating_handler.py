@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Benchmark SizedTimedRotatingFileHandler throughput on records per second.
+
+Compares the handler against the previous shouldRollover implementation,
+that formatted each record twice and did seek() + tell() on each emit.
+Both with maxMegaBytes > 0, big enough to never actually roll over.
+"""
+
+
+import logging
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from anglerfish.make_logger import _LOG_FORMAT, SizedTimedRotatingFileHandler
+
+
+RECORDS, MAX_MEGABYTES = 200_000, 1_024
+
+
+class LegacySizedTimedRotatingFileHandler(SizedTimedRotatingFileHandler):
+
+    """The previous implementation, format twice and seek on each record."""
+
+    def shouldRollover(self, record):
+        if self.stream is None:  # Delay was set.
+            self.stream = self._open()
+        if self.maxMegaBytes > 0:  # Are we rolling over?.
+            msg = str(self.format(record))
+            self.stream.seek(0, 2)  # Non-posix-compliant Windows feature.
+            if self.stream.tell() + len(msg) > self.maxMegaBytes * 1024 * 1024:
+                return 1
+        t = int(time.time())
+        if t >= self.rolloverAt:
+            return 1
+        return 0
+
+    emit = logging.handlers.BaseRotatingHandler.emit
+
+
+def bench(handler_class: type) -> float:
+    """Log RECORDS records with handler_class, return records per second."""
+    with TemporaryDirectory() as folder:
+        handler = handler_class(str(Path(folder) / "bench.log"),
+                                maxMegaBytes=MAX_MEGABYTES)
+        handler.setFormatter(logging.Formatter(fmt=_LOG_FORMAT))
+        log = logging.getLogger(handler_class.__name__)
+        log.propagate, log.level = False, logging.DEBUG
+        log.addHandler(handler)
+        start = time.perf_counter()
+        for number in range(RECORDS):
+            log.info("Benchmark record number %s of %s.", number, RECORDS)
+        elapsed = time.perf_counter() - start
+        log.removeHandler(handler)
+        handler.close()
+    return RECORDS / elapsed
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    for handler_class in (LegacySizedTimedRotatingFileHandler,
+                          SizedTimedRotatingFileHandler):
+        print(f"{handler_class.__name__:<40} "
+              f"{bench(handler_class):12,.0f} records/sec")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Benchmark pickled against shared memory arguments of multiprocessed.
+
+1 Gigabyte of input split on 8 slices of 128 Megabytes, for 8 workers,
+each worker computes the Adler32 of its slice, the input is:
+- Pickled, copied into every worker through pipes, the default.
+- shared_memory, copied once into shared memory, workers get its name only.
+- SharedBuffer slices, allocated on shared memory and filled there, no copy.
+"""
+
+
+import contextlib
+import os
+import time
+import zlib
+
+from anglerfish import MultiProcessExecutor, SharedBuffer, multiprocessed
+
+
+SIZE, WORKERS = 1024 * 1024 * 1024, 8
+SLICE = SIZE // WORKERS
+
+
+def bench(function, arguments, **kwargs) -> float:
+    """Return seconds to run the function on all the arguments."""
+    start = time.perf_counter()
+    results = function(zlib.adler32, arguments, **kwargs)
+    seconds = time.perf_counter() - start
+    assert len(results) == WORKERS
+    return seconds
+
+
+def run_multiprocessed(function, arguments, **kwargs) -> list:
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):  # Its progress on stdout.
+            return multiprocessed(function, arguments, cpu_num=WORKERS,
+                                  **kwargs)
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    data = bytearray(os.urandom(SLICE)) * WORKERS
+    slices = [memoryview(data)[_ * SLICE:(_ + 1) * SLICE]
+              for _ in range(WORKERS)]
+    print(f"{SIZE // 1024 // 1024} MB on {WORKERS} slices, CPUs: "
+          f"{os.cpu_count()}.\n")
+    pickled = [bytes(_) for _ in slices]  # memoryview is not picklable.
+    print(f"{'multiprocessed, pickled':<40}"
+          f"{bench(run_multiprocessed, pickled):8.2f} s")
+    print(f"{'multiprocessed, shared_memory':<40}"
+          f"{bench(run_multiprocessed, slices, shared_memory=1):8.2f} s")
+    for shared_memory in (0, 1):
+        with MultiProcessExecutor(WORKERS,
+                                  shared_memory=shared_memory) as executor:
+            executor.map(abs, range(WORKERS))  # Start the Processes.
+            seconds = bench(executor.map,
+                            slices if shared_memory else pickled)
+        print(f"{f'MultiProcessExecutor, shared_memory={shared_memory}':<40}"
+              f"{seconds:8.2f} s")
+    with SharedBuffer(size=SIZE) as shared:
+        shared.buf[:] = data  # Stands for data loaded straight into it.
+        del data, slices, pickled
+        with MultiProcessExecutor(WORKERS) as executor:
+            executor.map(abs, range(WORKERS))
+            seconds = bench(executor.map, [
+                shared[_ * SLICE:(_ + 1) * SLICE] for _ in range(WORKERS)])
+        print(f"{'MultiProcessExecutor, SharedBuffer':<40}{seconds:8.2f} s")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Benchmark cold start of an App using anglerfish, side-effect-free vs legacy.
+
+Legacy mode is what importing the package used to do, disable the Bytecode
+cache and reset SIGINT, then every App module imported after that compiles
+from source on every start. Side-effect-free mode is the default now.
+The App is a synthetic package of MODULES modules imported after anglerfish.
+"""
+
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from statistics import median
+from tempfile import TemporaryDirectory
+
+
+REPEAT, MODULES, FUNCTIONS = 20, 100, 50
+_APP = ("import time\n"
+        "start = time.perf_counter()\n"
+        "import anglerfish\n"
+        "{setup}\n"
+        "import app\n"
+        "print(time.perf_counter() - start)\n")
+CASES = {
+    "side-effect-free (default)": _APP.format(setup=""),
+    "legacy (set_process_defaults)": _APP.format(
+        setup="anglerfish.set_process_defaults()"),
+}
+
+
+def _make_app(folder: Path) -> Path:
+    """Write a synthetic App package with many small modules."""
+    (folder / "app").mkdir()
+    for index in range(MODULES):
+        (folder / "app" / f"module{index}.py").write_text("\n\n".join(
+            f"def function{_}(a, b=1, *args, **kwargs):\n"
+            f"    return [a + b + _ for _ in range({_})]"
+            for _ in range(FUNCTIONS)))
+    (folder / "app" / "__init__.py").write_text("\n".join(
+        f"from app import module{_}" for _ in range(MODULES)))
+    return folder
+
+
+def bench(code: str, repeat: int=REPEAT) -> float:
+    """Run code on a fresh interpreter repeat times, return median in ms."""
+    with TemporaryDirectory() as cwd:  # Package copy without any __pycache__.
+        shutil.copytree(Path(__file__).parent.parent / "anglerfish",
+                        Path(cwd) / "anglerfish",
+                        ignore=shutil.ignore_patterns("__pycache__"))
+        _make_app(Path(cwd))
+        env = dict(os.environ)
+        env.pop("PYTHONDONTWRITEBYTECODE", None)  # Let the App decide it.
+        timings = [float(subprocess.check_output(
+            (sys.executable, "-c", code), cwd=cwd, env=env))
+            for _ in range(repeat + 1)][1:]  # First run is the warmup.
+    return median(timings) * 1_000
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    for name, code in CASES.items():
+        print(f"{name:<40} {bench(code):8.2f} ms (median of {REPEAT})")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Benchmark walk2list and walk2dict, serial against parallel walkers.
+
+On a synthetic deep and wide tree, first on the local filesystem,
+then simulating a network filesystem like NFS, adding latency to scandir.
+"""
+
+
+import os
+import time
+from tempfile import TemporaryDirectory
+
+from anglerfish.walk2dict import walk2dict
+from anglerfish.walk2list import walk2list
+
+
+DEPTH, WIDTH, FILES, LATENCY = 4, 6, 20, 0.001  # LATENCY on seconds.
+
+
+def make_tree(folder: str, depth: int=DEPTH) -> None:
+    """Make a tree of WIDTH folders per level and FILES files per folder."""
+    for number in range(FILES):
+        open(os.path.join(folder, f"{number}.py"), "w").close()
+    if depth:
+        for number in range(WIDTH):
+            subfolder = os.path.join(folder, f"folder{number}")
+            os.mkdir(subfolder)
+            make_tree(subfolder, depth - 1)
+
+
+def bench(function, *args, **kwargs) -> float:
+    """Run function with args, return seconds elapsed."""
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def slow_scandir(path, _scandir=os.scandir):
+    """os.scandir with the round trip latency of a network filesystem."""
+    time.sleep(LATENCY)
+    return _scandir(path)
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    with TemporaryDirectory() as folder:
+        make_tree(folder)
+        folders = sum(WIDTH ** _ for _ in range(DEPTH + 1))
+        print(f"{folders} folders, {folders * FILES} files.")
+        for name, scandir in (("local", os.scandir),
+                              (f"{LATENCY * 1000:.0f}ms latency",
+                               slow_scandir)):
+            os.scandir = scandir
+            print(f"\n{name}:")
+            print(f"{'walk2list os.walk':<32}"
+                  f"{bench(walk2list, folder, '.py', topdown=False):8.3f}s")
+            print(f"{'walk2list scandir serial':<32}"
+                  f"{bench(walk2list, folder, '.py'):8.3f}s")
+            for workers in (4, 16, 64):
+                elapsed = bench(walk2list, folder, ".py", max_workers=workers)
+                print(f"{f'walk2list parallel {workers}':<32}{elapsed:8.3f}s")
+            print(f"{'walk2dict serial':<32}{bench(walk2dict, folder):8.3f}s")
+            for workers in (4, 16, 64):
+                elapsed = bench(walk2dict, folder, max_workers=workers)
+                print(f"{f'walk2dict parallel {workers}':<32}{elapsed:8.3f}s")
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Benchmark walk2dict_delta against a full walk, with few changed files.
+
+A full walk2dict_snapshot stats every file, walk2dict_delta does not list
+folders with the same mtime, and with quick=True does not stat its files.
+"""
+
+
+import os
+import time
+from tempfile import TemporaryDirectory
+
+from anglerfish.walk2dict import walk2dict_delta, walk2dict_snapshot
+
+
+FOLDERS, FILES, CHANGES = 1000, 200, 10
+
+
+def bench(function, *args, **kwargs) -> tuple:
+    """Run function with args, return seconds elapsed and the result."""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    with TemporaryDirectory() as folder:
+        for number in range(FOLDERS):
+            subfolder = os.path.join(folder, f"folder{number}")
+            os.mkdir(subfolder)
+            for name in range(FILES):
+                open(os.path.join(subfolder, f"{name}.txt"), "w").close()
+        print(f"{FOLDERS} folders, {FOLDERS * FILES} files, "
+              f"{CHANGES} new files.")
+        elapsed, snapshot = bench(walk2dict_snapshot, folder)
+        print(f"{'full snapshot':<24}{elapsed:8.3f}s")
+        for number in range(CHANGES):
+            open(os.path.join(folder, f"folder{number}", "new.txt"),
+                 "w").close()
+        for quick in (False, True):
+            elapsed, delta = bench(walk2dict_delta, snapshot, quick=quick)
+            print(f"{f'delta, quick={quick}':<24}{elapsed:8.3f}s "
+                  f"{len(delta.added)} added")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Benchmark walk2dict file records, RAM per million files and speed.
+
+Compares the previous implementation, os.walk plus 1 os.stat per file path
+into 11 keys dicts, against os.scandir DirEntry.stat into FileStat tuples,
+that also have the nanoseconds mtime_ns and ctime_ns.
+"""
+
+
+import os
+import time
+import tracemalloc
+from tempfile import TemporaryDirectory
+
+from anglerfish.walk2dict import _folder2dict
+from anglerfish.walk2list import _scandir
+
+
+FOLDERS, FILES = 100, 1000
+
+
+def records_previous(folder: str) -> list:
+    """The previous implementation, 1 dict per file."""
+    ret = []
+    for path, _, files in os.walk(folder):
+        for fyle in files:
+            (mode, ino, dev, nlink, uid, gid, size,
+             atime, mtime, ctime) = os.stat(path + os.sep + fyle)
+            ret.append({"name": fyle, "mode": mode, "ino": ino, "dev": dev,
+                        "nlink": nlink, "uid": uid, "gid": gid, "size": size,
+                        "atime": atime, "mtime": mtime, "ctime": ctime})
+    return ret
+
+
+def records_scandir(folder: str) -> list:
+    """The current implementation, 1 FileStat tuple per file."""
+    return [record for path, dirs, files in _scandir(folder)
+            for record in _folder2dict(folder, path, dirs, files)["files"]]
+
+
+def bench(function, *args) -> tuple:
+    """Run function with args, return seconds elapsed and bytes retained."""
+    start = time.perf_counter()
+    function(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()  # Slows down the run, measured apart.
+    result = function(*args)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return elapsed, retained
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    with TemporaryDirectory() as folder:
+        for number in range(FOLDERS):
+            subfolder = os.path.join(folder, f"folder{number}")
+            os.mkdir(subfolder)
+            for name in range(FILES):
+                open(os.path.join(subfolder, f"{name}.txt"), "w").close()
+        files = FOLDERS * FILES
+        print(f"{FOLDERS} folders, {files} files.")
+        for name, function in (("os.walk + os.stat, dict", records_previous),
+                               ("os.scandir, FileStat", records_scandir)):
+            function(folder)  # Warm up the filesystem cache.
+            elapsed, retained = bench(function, folder)
+            print(f"{name:<28}{elapsed:8.3f}s "
+                  f"{retained / files * 1_000_000 / 1024 ** 2:8.0f} "
+                  "Megabytes per million files")
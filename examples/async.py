@@ -27,7 +27,11 @@ async def async_on_thread(sync_code):
     return await Sync2Async.run_async_on_thread(sync_code)
 
 
-async_tasks = (asyncio.ensure_future(async_function(blocking_function)),
-               asyncio.ensure_future(async_on_process(blocking_function)),
-               asyncio.ensure_future(async_on_thread(blocking_function)))
-asyncio.get_event_loop().run_until_complete(asyncio.wait(async_tasks))
+async def main():
+    return await asyncio.gather(async_function(blocking_function),
+                                async_on_process(blocking_function),
+                                async_on_thread(blocking_function))
+
+
+if __name__.__contains__("__main__"):
+    asyncio.run(main())
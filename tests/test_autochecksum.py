@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Test for anglerfish.get_autochecksum()."""
+
+
+import os
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+from zlib import adler32, crc32
+
+from anglerfish import (autochecksum, get_autochecksum, get_autochecksums,
+                        verify_tree)
+
+
+class TestName(unittest.TestCase):
+
+    maxDiff, __slots__ = None, ()
+
+    def test_get_autochecksum(self):
+        with TemporaryDirectory() as folder:
+            filepaths = []
+            for size in (0, 1, 1024 * 1024, 3 * 1024 * 1024 + 7):
+                data = os.urandom(size)
+                filepath = os.path.join(folder, f"{size}.bin")
+                with open(filepath, "wb") as fyle:
+                    fyle.write(data)
+                self.assertEqual(get_autochecksum(filepath),
+                                 ".✔" + hex(adler32(data) & 0xffffffff)[2:])
+                filepaths.append(filepath)
+            self.assertEqual(get_autochecksums(filepaths, max_workers=2),
+                             {_: get_autochecksum(_) for _ in filepaths})
+            self.assertEqual(get_autochecksums(_ for _ in filepaths),
+                             {_: get_autochecksum(_) for _ in filepaths})
+
+    def test_autochecksum_algorithms(self):
+        with TemporaryDirectory() as folder:
+            filepath = os.path.join(folder, "test.txt")
+            with open(filepath, "wb") as fyle:
+                fyle.write(b"test")
+            adler = os.path.join(folder, "test.✔45d01c1.txt")  # As it was.
+            crc = os.path.join(folder, f"test.✔crc32-{crc32(b'test'):x}.txt")
+            autochecksum(filepath)
+            self.assertEqual(os.listdir(folder), [os.path.basename(adler)])
+            self.assertTrue(autochecksum(adler))
+            autochecksum(adler, update=True, algorithm="crc32")  # Still Ok.
+            self.assertEqual(os.listdir(folder), [os.path.basename(adler)])
+            with open(adler, "ab") as fyle:
+                fyle.write(b"\n")
+            self.assertFalse(autochecksum(adler))
+            os.rename(adler, filepath)
+            with open(filepath, "wb") as fyle:
+                fyle.write(b"test")
+            autochecksum(filepath, algorithm="crc32")
+            self.assertEqual(os.listdir(folder), [os.path.basename(crc)])
+            self.assertTrue(autochecksum(crc))
+            self.assertEqual(len(get_autochecksum(crc, algorithm="blake2b")),
+                             len(".✔blake2b-") + 16)
+            draft = os.path.join(folder, "report.✔draft-v2.txt")
+            os.rename(crc, draft)
+            self.assertFalse(autochecksum(draft))  # Unknown algorithm name.
+            with self.assertRaises(ValueError):
+                get_autochecksum(crc, algorithm="md5")
+
+    def test_verify_tree(self):
+        with TemporaryDirectory() as folder, TemporaryDirectory() as cache:
+            cache = os.path.join(cache, "cache.sqlite")
+            os.mkdir(os.path.join(folder, "sub"))
+            good = Path(folder, "sub", "good.✔45d01c1.txt")
+            bad = Path(folder, "bad.✔crc32-1.txt")
+            for filepath in (good, bad, Path(folder, "plain.txt"),
+                             Path(folder, "report.✔draft-v2.txt")):
+                filepath.write_bytes(b"test")
+                old = time.time() - 9  # Older than racy seconds, cacheable.
+                os.utime(filepath, (old, old))
+            self.assertEqual(verify_tree(folder, cache), {good: True,
+                                                          bad: False})
+            with mock.patch("anglerfish.make_autochecksum._hash_file",
+                            side_effect=AssertionError("Not cached")):
+                self.assertEqual(verify_tree(folder, cache), {good: True,
+                                                              bad: False})
+            good.write_bytes(b"tset")  # Changed, hashed again, not cached.
+            self.assertEqual(verify_tree(folder, cache), {good: False,
+                                                          bad: False})
+            with mock.patch("anglerfish.make_autochecksum._hash_file",
+                            return_value="45d01c1") as hasher:
+                verify_tree(folder, cache)
+                hasher.assert_called_once_with(good, "adler32")
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    unittest.main()
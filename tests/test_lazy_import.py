@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Test for anglerfish lazy imports."""
+
+
+import subprocess
+import sys
+import unittest
+
+import anglerfish
+
+
+class TestName(unittest.TestCase):
+
+    maxDiff, __slots__ = None, ()
+
+    def test_lazy_import(self):
+        code = ("import sys, anglerfish; print(sorted("
+                "_ for _ in sys.modules if _.startswith('anglerfish.')))")
+        output = subprocess.check_output((sys.executable, "-c", code))
+        self.assertEqual(output.strip(), b"[]")  # No submodules imported.
+
+    def test_lazy_all(self):
+        for name in anglerfish.__all__:
+            self.assertFalse(isinstance(getattr(anglerfish, name),
+                                        type(anglerfish)), name)
+        self.assertTrue(set(anglerfish.__all__).issubset(dir(anglerfish)))
+        with self.assertRaises(AttributeError):
+            anglerfish.this_does_not_exist
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Test for anglerfish.Sync2Async."""
+
+
+import asyncio
+import os
+import threading
+import time
+import unittest
+
+from anglerfish import Sync2Async
+
+
+class TestName(unittest.TestCase):
+
+    maxDiff, __slots__ = None, ()
+
+    def test_run_async_on_thread(self):
+        async def main():
+            name = await Sync2Async.run_async_on_thread(
+                lambda: threading.current_thread().name)
+            self.assertTrue(name.startswith("angler"))
+            self.assertEqual(await Sync2Async.run_async_on_thread(
+                divmod, 7, 2), (3, 1))
+            with self.assertRaises(ZeroDivisionError):
+                await Sync2Async.run_async_on_thread(divmod, 7, 0)
+            start = time.monotonic()
+            await asyncio.gather(*[Sync2Async.run_async_on_thread(
+                time.sleep, 0.2) for _ in range(8)])
+            self.assertLess(time.monotonic() - start, 1)  # In parallel.
+            start = time.monotonic()
+            for _ in range(100):
+                await Sync2Async.run_async_on_thread(int)
+            self.assertLess(time.monotonic() - start, 1)  # No 100ms polls.
+        asyncio.run(main())
+
+    def test_run_async_on_process(self):
+        async def main():
+            self.assertNotEqual(
+                await Sync2Async.run_async_on_process(os.getpid), os.getpid())
+            self.assertEqual(await Sync2Async.run_async_on_process(
+                divmod, 7, 2), (3, 1))
+            with self.assertRaises(ZeroDivisionError):
+                await Sync2Async.run_async_on_process(divmod, 7, 0)
+            return Sync2Async.get_event_loop()
+        self.assertIsInstance(asyncio.run(main()), asyncio.AbstractEventLoop)
+        self.assertTrue(asyncio.run(main()).is_closed())  # Not import-time.
+
+    def test_map(self):
+        consumed, running, lock = [], [0, 0], threading.Lock()
+
+        def items():
+            for _ in range(400):
+                consumed.append(_)
+                yield _
+
+        def square(number):
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.001)
+            with lock:
+                running[0] -= 1
+            return number * number
+
+        async def main():
+            results = Sync2Async.map(square, items(), concurrency=2,
+                                     chunksize=3)
+            self.assertEqual(await results.__anext__(), 0)
+            self.assertLessEqual(len(consumed), 2 * 16 * 3)  # Bounded, lazy.
+            self.assertEqual([0] + [_ async for _ in results],
+                             [_ * _ for _ in range(400)])
+            self.assertLessEqual(running[1], 2)  # Chunks run sequentially.
+            self.assertEqual(sorted([_ async for _ in Sync2Async.as_completed(
+                abs, range(-50, 50), chunksize=7)]),
+                sorted(map(abs, range(-50, 50))))
+            self.assertEqual([_ async for _ in Sync2Async.map(
+                abs, range(-9, 0), chunksize=4, processes=True)],
+                list(range(9, 0, -1)))
+            with self.assertRaises(TypeError):
+                [_ async for _ in Sync2Async.map(abs, (1, "2", 3))]
+            for ordered in (True, False):
+                results = []  # Slow consumer, chunks done while it awaits.
+                async for result in Sync2Async.map(
+                        abs, range(50), concurrency=1, ordered=ordered):
+                    time.sleep(0.01)
+                    await asyncio.sleep(0)
+                    results.append(result)
+                self.assertEqual(sorted(results), list(range(50)))
+        asyncio.run(main())
+
+    def test_set_max_workers(self):
+        sizes = Sync2Async.set_max_workers()
+        self.assertEqual(Sync2Async.set_max_workers(threads=2)["threads"], 2)
+        self.assertEqual(asyncio.run(Sync2Async.run_async_on_thread(
+            lambda: threading.current_thread().name)).startswith("angler"),
+            True)
+        Sync2Async.set_max_workers(**sizes)
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    unittest.main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Test for anglerfish.make_logger()."""
+
+
+import gzip
+import json
+import logging
+import lzma
+import os
+import sys
+import unittest
+import zipfile
+from tempfile import TemporaryDirectory
+
+from anglerfish.make_logger import (BoundedQueueHandler, ColoredFormatter,
+                                    JSONFormatter, RateLimitFilter,
+                                    SizedTimedRotatingFileHandler, _ZipRotator)
+
+
+class _ListHandler(logging.Handler):
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record.getMessage())
+
+
+class TestName(unittest.TestCase):
+
+    maxDiff, __slots__ = None, ()
+
+    def test_queue_handler(self):
+        target = _ListHandler()
+        handler = BoundedQueueHandler((target, ), queue_size=4)
+        log = logging.getLogger("test_queue_handler")
+        log.propagate, log.level = False, logging.DEBUG
+        log.addHandler(handler)
+        for number in range(10):  # Listener not started yet, fills the Queue.
+            log.info("Record %s", number)
+        self.assertEqual(handler.queue.qsize(), 4)
+        self.assertEqual(handler.dropped, 7)
+        handler.start()
+        handler.stop()
+        self.assertEqual(target.records[:3],
+                         ["Record 0", "Record 1", "Record 2"])
+        self.assertIn("Backlog of 3 log records", target.records[3])
+        self.assertIn("Dropped 7 log records", target.records[-1])
+        self.assertEqual(handler.dropped, 0)
+        handler.stop()  # Stop twice is Ok.
+        log.removeHandler(handler)
+
+    def test_sized_handler(self):
+        with TemporaryDirectory() as folder:
+            filename = os.path.join(folder, "test.log")
+            handler = SizedTimedRotatingFileHandler(filename, maxMegaBytes=1)
+            record = logging.makeLogRecord({"msg": "ñ" * 99_999 + "."})
+            for _ in range(5):
+                handler.emit(record)
+            self.assertEqual(handler.stream_size, os.path.getsize(filename))
+            handler.close()
+            handler = SizedTimedRotatingFileHandler(filename, maxMegaBytes=1)
+            self.assertEqual(handler.stream_size, 1_000_000)  # Re-synced.
+            handler.rotator = None  # Plain rename.
+            handler.emit(record)  # 1_000_000 + 200_000 bytes, rolls over.
+            self.assertEqual(handler.stream_size, 200_000)
+            self.assertEqual(len(os.listdir(folder)), 2)
+            handler.close()
+
+    def test_rotator(self):
+        readers = {
+            "zip": lambda path: zipfile.ZipFile(path).read("test.log.1"),
+            "gzip": lambda path: gzip.open(path).read(),
+            "lzma": lambda path: lzma.open(path).read(),
+            "none": lambda path: open(path, "rb").read()}
+        extensions = {"zip": ".zip", "gzip": ".gz", "lzma": ".xz", "none": ""}
+        for codec, reader in readers.items():
+            with TemporaryDirectory() as folder:
+                origin = os.path.join(folder, "test.log")
+                with open(origin, "wb") as log_file:
+                    log_file.write(b"log line\n" * 9_999)
+                rotator = _ZipRotator(codec, 1)
+                rotator(origin, origin + ".1")
+                rotator.wait()
+                self.assertFalse(os.path.exists(origin))
+                self.assertEqual(os.listdir(folder),
+                                 ["test.log.1" + extensions[codec]])
+                self.assertEqual(reader(origin + ".1" + extensions[codec]),
+                                 b"log line\n" * 9_999)
+        with self.assertRaises(ValueError):
+            _ZipRotator("rar")
+
+    def test_json_formatter(self):
+        formatter = JSONFormatter()
+        record = logging.makeLogRecord({"name": "test", "lineno": 9,
+                                        "msg": 'Ünïcode "%s"\n',
+                                        "args": ("quoted", )})
+        line = formatter.format(record)
+        self.assertNotIn("\n", line)
+        self.assertEqual(tuple(json.loads(line)), JSONFormatter.fields)
+        self.assertEqual(json.loads(line)["message"], 'Ünïcode "quoted"\n')
+        self.assertEqual(json.loads(line)["lineno"], 9)
+        try:
+            raise ValueError("test")
+        except ValueError:
+            record = logging.makeLogRecord({"name": "test",
+                                            "exc_info": sys.exc_info()})
+        self.assertIn("ValueError: test",
+                      json.loads(formatter.format(record))["exc_text"])
+
+    def test_colored_formatter(self):
+        record = logging.makeLogRecord({"msg": "%s", "args": ("test", ),
+                                        "levelno": logging.WARNING})
+        self.assertEqual(ColoredFormatter().format(record),
+                         "\x1b[33mtest \x1b[0m")
+        self.assertEqual(record.msg, "%s")  # Record is not modified.
+        record.levelno = 25  # Custom level, uses the color of INFO.
+        self.assertEqual(ColoredFormatter().format(record),
+                         "\x1b[32mtest \x1b[0m")
+        self.assertIn(ColoredFormatter(emoji=True).format(record), (
+            "\x1b[32mtest \x1b[0m 😸 ", "\x1b[32mtest \x1b[0m 😽 ",
+            "\x1b[32mtest \x1b[0m"))
+
+    def test_ratelimit_filter(self):
+        ratelimit_filter = RateLimitFilter(rate=0.001, burst=2)
+        targets = (_ListHandler(), _ListHandler())
+        log = logging.getLogger("test_ratelimit_filter")
+        log.propagate, log.level = False, logging.DEBUG
+        for target in targets:  # 1 Filter shared by 2 handlers.
+            target.addFilter(ratelimit_filter)
+            log.addHandler(target)
+        for number in range(10):
+            log.warning("Storm %s", number)
+            log.info("Storm %s", number)  # Other level, not similar.
+        log.warning("Calm")
+        ratelimit_filter.flush()
+        for target in targets:
+            self.assertEqual(target.records[:5], [
+                "Storm 0", "Storm 0", "Storm 1", "Storm 1", "Calm"])
+            self.assertEqual(sorted(target.records[5:]), [
+                "Suppressed 8 similar log records: 'Storm %s'."] * 2)
+            log.removeHandler(target)
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Test for anglerfish.MultiProcessExecutor."""
+
+
+import contextlib
+import io
+import os
+import unittest
+import zlib
+
+from anglerfish import MultiProcessExecutor, SharedBuffer, multiprocessed
+from anglerfish.make_multiprocess import _get_executor
+
+
+class TestName(unittest.TestCase):
+
+    maxDiff, __slots__ = None, ()
+
+    def test_multiprocess_executor(self):
+        with MultiProcessExecutor(cpu_num=2, thread_num=2) as executor:
+            self.assertEqual(executor.map(abs, range(-10, 0), chunksize=3),
+                             list(range(10, 0, -1)))
+            self.assertEqual(sorted(executor.imap_unordered(
+                abs, range(-10, 0), chunksize=4)), list(range(1, 11)))
+            self.assertEqual(executor.progress, 20)
+            with self.assertRaises(TypeError):
+                executor.map(divmod, ((7, 2), ))  # 1 tuple, not 2 arguments.
+            self.assertEqual(next(executor.imap(  # Lazy, not all consumed.
+                abs, range(-10**12, 0), chunksize=8)), 10**12)
+
+    def test_shared_memory(self):
+        data = [os.urandom(64) for _ in range(5)] + [b"tiny"]
+        with MultiProcessExecutor(cpu_num=2, shared_memory=32) as executor:
+            results = executor.map(bytes, data, chunksize=2)
+            self.assertEqual([type(_) for _ in results],
+                             [SharedBuffer] * 5 + [bytes])
+            self.assertEqual([getattr(_, "tobytes", lambda: _)()
+                              for _ in results], data)
+            names = [_.name for _ in results[:5]]
+            del results  # Results owned by this Process, unlinked on del.
+            for name in names:
+                self.assertFalse(os.path.exists(f"/dev/shm/{name}"))
+            with SharedBuffer(b"".join(data)) as shared:
+                self.assertEqual(executor.map(zlib.crc32, [
+                    shared[:64], shared[64:128]]), [
+                    zlib.crc32(data[0]), zlib.crc32(data[1])])
+        self.assertEqual(multiprocessed(len, data, shared_memory=32),
+                         [64] * 5 + [4])
+
+    def test_multiprocessed(self):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(multiprocessed(abs, list(range(-100, 0)),
+                                            cpu_num=2, thread_num=3),
+                             list(range(100, 0, -1)))
+            self.assertEqual(multiprocessed(abs, list(range(-9, 0)),
+                                            cpu_num=4, chunksize=2),
+                             list(range(9, 0, -1)))  # Not split on 4 parts.
+            self.assertEqual(multiprocessed(abs, []), [])
+            hits = _get_executor.cache_info().hits
+            multiprocessed(abs, [-1], cpu_num=2, thread_num=3)
+            self.assertEqual(_get_executor.cache_info().hits, hits + 1)
+            with MultiProcessExecutor(cpu_num=2) as executor:
+                self.assertEqual(multiprocessed(abs, [-1, -2],
+                                                executor=executor), [1, 2])
+                self.assertEqual(executor.progress, 2)  # Reused the executor.
+        self.assertIn("100.0 ||->", output.getvalue())
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            multiprocessed(abs, list(range(-9, 0)), cpu_num=2, chunksize=2)
+        self.assertEqual(output.getvalue().count("||->"), 5)  # Per chunk.
+        self.assertTrue(output.getvalue().endswith("100.0 ||->\r"))
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    unittest.main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Test for anglerfish.watch()."""
+
+
+import asyncio
+import os
+import threading
+import time
+import unittest
+from tempfile import TemporaryDirectory
+
+from anglerfish import Watcher, awatch, awatch_changes, watch
+from anglerfish.make_watch import _AsyncInotify, _get_libc
+
+
+def _write_later(file_path: str, data: bytes, delay: float=0.2,
+                 replace: bool=False) -> threading.Timer:
+    """Write data to file path after delay, replacing it with a rename."""
+    def write():
+        with open(file_path + ".tmp" if replace else file_path, "wb") as fyle:
+            fyle.write(data)
+        if replace:
+            os.replace(file_path + ".tmp", file_path)
+    timer = threading.Timer(delay, write)
+    timer.start()
+    return timer
+
+
+class TestName(unittest.TestCase):
+
+    maxDiff, __slots__ = None, ()
+
+    def test_watch(self):
+        backends = ("poll", "inotify") if _get_libc() else ("poll", )
+        for backend in backends:
+            with TemporaryDirectory() as folder:
+                file_path = os.path.join(folder, "test.txt")
+                with open(file_path, "wb") as fyle:
+                    fyle.write(b"test")
+                for data, replace in ((b"tset", False), (b"test", True)):
+                    start = time.monotonic()
+                    timer = _write_later(file_path, data, replace=replace)
+                    self.assertEqual(watch(
+                        file_path, callback=len, interval=0.01, timeout=9,
+                        silent=True, backend=backend), len(file_path))
+                    self.assertLess(time.monotonic() - start, 5)
+                    timer.join()
+                with self.assertRaises(TimeoutError):
+                    watch(file_path, interval=0.01, timeout=0.3,
+                          silent=True, backend=backend)
+        with self.assertRaises(ValueError):
+            watch(__file__, backend="kqueue")
+        with self.assertWarns(DeprecationWarning):
+            with self.assertRaises(TimeoutError):
+                watch(__file__, interval=0.01, timeout=0.1, repetitions=1,
+                      silent=True, backend="poll")
+
+    def test_watch_folder(self):
+        backends = ("poll", "inotify") if _get_libc() else ("poll", )
+        for backend in backends:
+            with TemporaryDirectory() as folder:
+                subfolder = os.path.join(folder, "sub")
+                os.mkdir(subfolder)
+                timer = _write_later(os.path.join(subfolder, "new.txt"), b"")
+                self.assertEqual(watch(subfolder, interval=0.01, timeout=5,
+                                       silent=True, backend=backend),
+                                 subfolder)
+                timer.join()
+                new = os.path.join(subfolder, "new2.txt")
+
+                async def main():
+                    asyncio.get_running_loop().call_later(
+                        0.2, _write_later, new, b"", 0)
+                    return await awatch(subfolder, interval=0.01, timeout=5,
+                                        backend=backend)
+                self.assertEqual(asyncio.run(main()), subfolder)
+
+    def test_watcher(self):
+        backends = ("poll", "inotify") if _get_libc() else ("poll", )
+        for backend in backends:
+            with TemporaryDirectory() as folder:
+                files = [os.path.join(folder, f"{_}.txt") for _ in range(9)]
+                for file_path in files:
+                    open(file_path, "w").close()
+                subfolder = os.path.join(folder, "sub")
+                os.mkdir(subfolder)
+                calls, called = [], threading.Event()
+
+                def callback(path):
+                    calls.append(path)
+                    called.set()
+                with Watcher(interval=0.02, debounce=0.2,
+                             backend=backend) as watcher:
+                    for path in files + [subfolder]:
+                        watcher.add(path, callback)
+                    for number in range(5):  # Burst of changes, 1 callback.
+                        with open(files[0], "a") as fyle:
+                            fyle.write(str(number))
+                        time.sleep(0.01)
+                    self.assertTrue(called.wait(5))
+                    time.sleep(0.3)
+                    self.assertEqual(calls, [files[0]])
+                    called.clear()
+                    open(os.path.join(subfolder, "new.txt"), "w").close()
+                    self.assertTrue(called.wait(5))
+                    self.assertEqual(calls[-1], subfolder)
+                    watcher.remove(files[1])
+                    with open(files[1], "w") as fyle:
+                        fyle.write("removed")
+                    time.sleep(0.3)
+                    for path in files + [subfolder] * 2:
+                        watcher.remove(path)
+                    self.assertEqual((watcher.wds, watcher.watched), ({}, {}))
+                self.assertEqual(len(calls), 2)
+
+    def test_awatch(self):
+        backends = ("poll", "inotify") if _get_libc() else ("poll", )
+
+        async def main(folder, backend):
+            files = [os.path.join(folder, f"{_}.txt") for _ in range(300)]
+            for file_path in files:
+                open(file_path, "w").close()
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.2, _write_later, files[7], b"test", 0)
+
+            async def callback(path):
+                return path
+            watches = [awatch(_, callback, interval=0.01, timeout=0.5,
+                              backend=backend) for _ in files]
+            results = await asyncio.gather(*watches, return_exceptions=True)
+            self.assertEqual(results[7], files[7])
+            self.assertIsInstance(results[0], TimeoutError)
+            self.assertEqual(_AsyncInotify._instances.get(loop), None)
+            changes = awatch_changes((files[0], folder), interval=0.01,
+                                     debounce=0.1, backend=backend)
+            loop.call_later(0.2, _write_later, files[0], b"test", 0)
+            self.assertEqual(sorted([await changes.__anext__(),
+                                     await changes.__anext__()]),
+                             sorted([files[0], folder]))
+            await changes.aclose()
+            self.assertEqual(_AsyncInotify._instances.get(loop), None)
+        for backend in backends:
+            with TemporaryDirectory() as folder:
+                asyncio.run(main(folder, backend))
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    unittest.main()
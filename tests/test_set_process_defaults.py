@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Test for anglerfish.set_process_defaults()."""
+
+
+import os
+import signal
+import subprocess
+import sys
+import unittest
+
+from anglerfish import set_process_defaults
+
+
+class TestName(unittest.TestCase):
+
+    maxDiff, __slots__ = None, ()
+
+    def test_import_has_no_side_effects(self):
+        code = ("import signal, sys, anglerfish; print(sys.dont_write_bytecode,"
+                " signal.getsignal(signal.SIGINT) is signal.default_int_handler)")
+        env = dict(os.environ)
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        output = subprocess.check_output((sys.executable, "-c", code), env=env)
+        self.assertEqual(output.strip(), b"False True")
+
+    def test_set_process_defaults(self):
+        old_bytecode = sys.dont_write_bytecode
+        old_sigint = signal.getsignal(signal.SIGINT)
+        try:
+            self.assertTrue(set_process_defaults())
+            self.assertTrue(sys.dont_write_bytecode)
+            self.assertEqual(signal.getsignal(signal.SIGINT), signal.SIG_DFL)
+            self.assertTrue(set_process_defaults(bytecode=True, sigint=False))
+            self.assertFalse(sys.dont_write_bytecode)
+        finally:
+            sys.dont_write_bytecode = old_bytecode
+            signal.signal(signal.SIGINT, old_sigint)
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Test for anglerfish.walk2dict()."""
+
+
+import json
+import os
+import time
+import unittest
+from tempfile import TemporaryDirectory
+
+from anglerfish import walk2dict, walk2dict_delta, walk2dict_snapshot
+from anglerfish.walk2dict import Walk2DictSnapshot
+
+
+class TestName(unittest.TestCase):
+
+    maxDiff, __slots__ = None, ()
+
+    def test_walk2dict(self):
+        with TemporaryDirectory() as folder:
+            for path in ("a.py", ".b.py", "sub/c.txt", ".hidden/d.txt"):
+                os.makedirs(os.path.join(folder, os.path.dirname(path)),
+                            exist_ok=True)
+                with open(os.path.join(folder, path), "w") as fyle:
+                    fyle.write(path)
+            result = walk2dict(folder).dict
+            self.assertEqual(result["parent"], "root")
+            self.assertEqual(result["dirs"], ["sub"])
+            self.assertEqual([_["name"] for _ in result["files"]], ["a.py"])
+            self.assertEqual(result["files"][0]["size"], 4)
+            self.assertEqual(result["files"][0].size, 4)
+            self.assertIsInstance(result["files"][0], tuple)  # Compact.
+            self.assertEqual(json.loads(walk2dict(folder).json)["files"],
+                             [result["files"][0]._asdict()])
+            self.assertEqual(walk2dict(folder, max_workers=4).dict, result)
+            self.assertEqual(
+                sorted(walk2dict(folder, showhidden=True).dict["dirs"]),
+                [".hidden", "sub"])
+
+    def test_walk2dict_delta(self):
+        with TemporaryDirectory() as folder:
+            def path(*names):
+                return os.path.join(folder, *names)
+            for name in ("a.txt", "b.txt", "sub/c.txt", "gone/d.txt",
+                         ".git/e.txt"):
+                os.makedirs(os.path.dirname(path(name)), exist_ok=True)
+                with open(path(name), "w") as fyle:
+                    fyle.write(name)
+            old = time.time() - 9
+            old_ns = int(old) * 1_000_000_000
+            for name in ("", "sub", "gone"):  # Folders mtime are on the past.
+                os.utime(path(name), (old, old))
+            snapshot = walk2dict_snapshot(folder)
+            self.assertEqual(len(snapshot), 4)  # .git is not walked.
+            snapshot = Walk2DictSnapshot.load(
+                snapshot.save(path(".git", "snapshot.json")))
+            delta = walk2dict_delta(snapshot)
+            self.assertEqual(delta[:3], ({}, {}, {}))
+            with open(path("sub", "c.txt"), "a") as fyle:
+                fyle.write("modified")  # sub mtime is the same.
+            os.remove(path("b.txt"))
+            os.remove(path("gone", "d.txt"))
+            os.rmdir(path("gone"))
+            with open(path("sub", "new.txt"), "w") as fyle:
+                fyle.write("new")
+            delta = walk2dict_delta(snapshot, quick=True)
+            self.assertEqual(list(delta.added), [path("sub", "new.txt")])
+            self.assertEqual(sorted(delta.removed), [
+                path("b.txt"), path("gone", "d.txt")])
+            with open(path("sub", "c.txt"), "a") as fyle:
+                fyle.write("again")  # Modified in place, not found by quick.
+            self.assertEqual(walk2dict_delta(delta.snapshot, quick=True)[:3],
+                             ({}, {}, {}))
+            delta = walk2dict_delta(delta.snapshot)
+            self.assertEqual(list(delta.modified), [path("sub", "c.txt")])
+            self.assertEqual(delta.modified[path("sub", "c.txt")].size, 22)
+            os.utime(path("a.txt"), ns=(old_ns, old_ns))
+            snapshot = walk2dict_snapshot(folder)
+            with open(path("a.txt"), "w") as fyle:
+                fyle.write("A.TXT")  # Same size, same second as snapshot.
+            os.utime(path("a.txt"), ns=(old_ns, old_ns + 1000))
+            delta = walk2dict_delta(snapshot)
+            self.assertEqual(list(delta.modified), [path("a.txt")])
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    unittest.main()
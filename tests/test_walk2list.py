@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+"""Test for anglerfish.walk2list()."""
+
+
+import json
+import os
+import re
+import unittest
+from collections import deque
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from anglerfish import iwalk2list, walk2list
+from anglerfish.walk2list import _scan
+
+
+class TestName(unittest.TestCase):
+
+    maxDiff, __slots__ = None, ()
+
+    def test_walk2list(self):
+        with TemporaryDirectory() as folder:
+            for path in ("a.py", "b.pyc", ".c.py", "sub/d.py", "sub/e.txt",
+                         "sub/deep/f.py", "other/g.py"):
+                os.makedirs(os.path.join(folder, os.path.dirname(path)),
+                            exist_ok=True)
+                open(os.path.join(folder, path), "w").close()
+            expected = [os.path.abspath(os.path.join(r, f))
+                        for r, _, fs in os.walk(folder) for f in fs
+                        if f.endswith(".py") and not f.startswith(".")]
+            self.assertEqual(list(iwalk2list(folder, ".py")), expected)
+            self.assertEqual(sorted(walk2list(folder, ".py", max_workers=4
+                                              ).list), sorted(expected))
+            result = walk2list(folder, ".py", ".pyc")
+            self.assertNotIn("json", vars(result))  # Not computed yet.
+            self.assertEqual(json.loads(result.json), expected)
+            self.assertIn("json", vars(result))  # Cached.
+            self.assertEqual(result.tuple, tuple(expected))
+            self.assertEqual(result.deque, deque(expected))
+            self.assertEqual(result[3], set(expected))
+            self.assertEqual(result._asdict()["frozenset"],
+                             frozenset(expected))
+            self.assertEqual(len(walk2list(folder, ".py", showhidden=True
+                                           ).list), 5)
+            self.assertEqual(walk2list(folder, ".py", topdown=False).list, [
+                os.path.abspath(os.path.join(r, f))
+                for r, _, fs in os.walk(folder, topdown=False) for f in fs
+                if f.endswith(".py") and not f.startswith(".")])
+            with self.assertRaises(AttributeError):
+                result.dict
+            errors = []
+            self.assertEqual(list(iwalk2list(os.path.join(folder, "no"), "",
+                                             onerror=errors.append)), [])
+            self.assertIsInstance(errors[0], FileNotFoundError)
+            self.assertEqual(list(iwalk2list(os.path.join(folder, "no"), "",
+                                             onerror=errors.append,
+                                             max_workers=2)), [])
+            self.assertIsInstance(errors[1], FileNotFoundError)
+
+    def test_walk2list_patterns(self):
+        with TemporaryDirectory() as folder:
+            for path in ("a.py", "a.min.js", "b.JS", "test_1.py", "c.txt",
+                         "node_modules/d.js", "sub/e.js", "sub/test_2.py"):
+                os.makedirs(os.path.join(folder, os.path.dirname(path)),
+                            exist_ok=True)
+                open(os.path.join(folder, path), "w").close()
+
+            def names(**kwargs):
+                return sorted(os.path.relpath(_, folder) for _ in iwalk2list(
+                    folder, **kwargs))
+            self.assertEqual(names(include="*.py"), [
+                "a.py", os.path.join("sub", "test_2.py"), "test_1.py"])
+            self.assertEqual(names(include=(re.compile(r"\.js$", re.I), ),
+                                   exclude=("node_modules", "*.min.*")),
+                             ["b.JS", os.path.join("sub", "e.js")])
+            self.assertEqual(names(target=".py",
+                                   exclude=[re.compile(r"test_\d")]),
+                             ["a.py"])
+            with mock.patch("anglerfish.walk2list._scan",
+                            wraps=_scan) as scan:
+                walk2list(folder, exclude="node_modules")
+                walk2list(folder, exclude="node_modules", topdown=False)
+                walk2list(folder, exclude="node_modules", max_workers=2)
+            self.assertEqual(scan.call_count, 6)  # Root and sub, 3 times.
+            self.assertNotIn(mock.call(os.path.join(
+                os.path.abspath(folder), "node_modules")),
+                scan.call_args_list)
+
+
+if __name__.__contains__("__main__"):
+    print(__doc__)
+    unittest.main()